@@ -1,9 +1,26 @@
+import asyncio
+import functools
 import logging
 import re
+import threading
+import time
+import weakref
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from importlib.metadata import PackageNotFoundError, version
-from typing import List
+from typing import Callable, Dict, List, Union
 
+from .aio import run_in_executor
+from .base_loader import LoaderNotReady
 from .base_secret_manager import BaseSecretManager
+from .cache import CachedLookup
+from .coercion import CoercedLookup, coerce, get_coercer
+from .derived import Derived
+from .exceptions import ImproperlyConfigured
+from .fork import after_fork
+from .metrics import InstrumentedLookup, Metrics
+from .warm_start import WarmStart, fingerprint, loader_name
 
 try:
     __version__ = version("configular")
@@ -15,11 +32,65 @@ except PackageNotFoundError:
 
 logger = logging.getLogger(__name__)
 
-SECRET_KEY_RE = re.compile(r"(%%[^$]*%%)")
+# A placeholder, "%%key%%", stopping at the first closing "%%"
+SECRET_KEY_RE = re.compile(r"(%%[^%$]+%%)")
+
+# Raw values parsed into templates, most recently used last
+TEMPLATE_CACHE_SIZE = 1024
 
 warn_about_constance = True
 warn_about_django = True
 
+# Every Settings object, so that loaders can invalidate them by prefix
+_registry = weakref.WeakSet()
+
+# Threads querying each secrets manager concurrently, created when first
+# needed. Every manager has its own pool, so one whose backend hangs can only
+# tie up its own threads, and lookups on the others are never queued behind it.
+MANAGER_POOL_SIZE = 8
+_manager_pools = weakref.WeakKeyDictionary()
+_manager_pools_lock = threading.Lock()
+
+
+def _get_manager_pool(sm):
+    with _manager_pools_lock:
+        pool = _manager_pools.get(sm)
+        if pool is None:
+            pool = _manager_pools[sm] = ThreadPoolExecutor(
+                max_workers=MANAGER_POOL_SIZE,
+                thread_name_prefix=f"configular-{type(sm).__name__}",
+            )
+        return pool
+
+
+def invalidate(prefix, key=None):
+    """Invalidate `key`, or every key, of all Settings objects for `prefix`."""
+    for settings in list(_registry):
+        if settings.prefix == prefix:
+            settings.invalidate(key)
+
+
+def warm():
+    """Resolve every setting and secret of all Settings objects.
+
+    Call this in a server's master process before it forks workers, e.g. in a
+    gunicorn `on_starting` hook, so that workers inherit the loaded values and
+    cached secrets rather than each looking them up again.
+    """
+    for settings in list(_registry):
+        settings.warm()
+
+
+@after_fork
+def _after_fork():
+    global _manager_pools, _manager_pools_lock
+    # The pools' threads don't survive the fork
+    _manager_pools = weakref.WeakKeyDictionary()
+    _manager_pools_lock = threading.Lock()
+
+    for settings in list(_registry):
+        settings._lock = threading.RLock()
+
 
 class Settings:
     def __init__(
@@ -28,14 +99,72 @@ class Settings:
         prefix: str,
         loaders: List[type] = None,
         secrets_managers: List[BaseSecretManager] = None,
+        cache_ttl: Union[float, Dict[str, float]] = None,
+        refresh_ahead: float = 0.75,
+        metrics: Metrics = None,
+        types: Dict[str, Union[type, Callable]] = None,
+        concurrent_managers: bool = False,
+        warm_start: str = None,
     ):
+        """
+        `cache_ttl` opts in to caching looked up values for that many seconds,
+        either for every key or per key with a dict. Cached values are
+        refreshed in the background once `refresh_ahead` of the ttl has passed.
+
+        `metrics` opts in to recording reads and lookup latencies, see `stats`.
+
+        `types` maps keys to a type, e.g. `int`, `bool`, `list`, `dict` (JSON)
+        or `timedelta`, or a function, that raw values are coerced with. Each
+        value is coerced once, after its placeholders are resolved. Invalid
+        defaults raise `ImproperlyConfigured` here, and invalid values when
+        their key is set up, e.g. by `warm`, or first read.
+
+        `concurrent_managers` queries every secrets manager at once, rather
+        than one after another, still preferring the first in the list. A
+        manager's `timeout` then bounds how long its answer is waited for.
+
+        `warm_start` is the path of a file remembering which loader owns each
+        key and the last values of dynamic loaders. A later process with the
+        same defaults and loaders serves those last values for keys whose
+        loader isn't ready yet.
+        """
+        self._coercers = {}
+        for key, type_ in (types or {}).items():
+            if key not in defaults:
+                raise ImproperlyConfigured(f"{key} has a type but no default")
+            self._coercers[key] = get_coercer(type_)
+
+        # Keys whose default is already coerced, and must not be coerced again
+        self._coerced_defaults = set()
+        if self._coercers:
+            defaults = dict(defaults)
+            for key, coercer in self._coercers.items():
+                # Defaults with placeholders are coerced once they're resolved
+                if not _has_placeholder(defaults[key]):
+                    defaults[key] = coerce(key, defaults[key], coercer)
+                    self._coerced_defaults.add(key)
+
         self.defaults = defaults
         self.prefix = prefix
+        self.cache_ttl = cache_ttl
+        self.refresh_ahead = refresh_ahead
+        self.metrics = metrics
+        self.concurrent_managers = concurrent_managers
+        self.warm_start = WarmStart(warm_start) if warm_start else None
+        self._warm = None
+        self._lock = threading.RLock()
+
+        # Bumped whenever any key, or that key, is invalidated
+        self.version = 0
+        self._versions = dict.fromkeys(defaults, 0)
+        # name -> Derived
+        self._derived = {}
 
         self.reconfigure(
             loaders=loaders or [],
             secrets_managers=secrets_managers or [],
         )
+        _registry.add(self)
 
     def reconfigure(
         self,
@@ -45,92 +174,693 @@ class Settings:
     ):
         """Update `loaders` and/or `secrets_managers`, and reset lookups."""
 
-        if loaders is not None:
-            self.loaders = loaders
+        with self._lock:
+            if loaders is not None:
+                self.loaders = loaders
 
-        if secrets_managers is not None:
-            self.secrets_managers = secrets_managers
+            if secrets_managers is not None:
+                self.secrets_managers = secrets_managers
+
+            for LoaderClass in self.loaders:
+                if hasattr(LoaderClass, "reset"):
+                    LoaderClass.reset(self.prefix)
+
+            self._reset()
+
+    def invalidate(self, key=None):
+        """Forget the lookup and any cached values for `key`, or every key.
+
+        The loader for the key is found again on its next access.
+        """
+        with self._lock:
+            if key is None:
+                self._reset()
+                return
+
+            self._lookups.pop(key, None)
+            self._scanners.pop(key, None)
+            self._owned = {}
+            if key in self._versions:
+                self._versions[key] += 1
+            self.version += 1
+            if self._warm is not None:
+                # The key's loader may have changed
+                self._warm[0].pop(key, None)
+            if key in self._stored:
+                self._stored.discard(key)
+                del self.__dict__[key]
+            self._init = False
+
+    def _reset(self):
+        for key in self.__dict__.get("_stored", ()):
+            del self.__dict__[key]
 
         self._lookups = {}
+        self._scanners = {}
+        self._stored = set()
+        self.version += 1
+        for key in self._versions:
+            self._versions[key] += 1
+        # LoaderClass -> keys it owns, for loaders with `bulk_has_keys`
+        self._owned = {}
         self._init = False
 
+        # key -> the name of the loader found for it, None for the default
+        self._owners = {}
+        # Whether a loader wasn't ready, so the owners may be wrong
+        self._not_ready = False
+        self._warm_saved = False
+        if self._warm is not None:
+            # Loaders may own other keys now, keep only the last values
+            self._warm = ({}, self._warm[1])
+
     def __getattr__(self, name):
+        try:
+            lookup = self._lookups[name]
+        except KeyError:
+            derived = self._derived.get(name)
+            if derived is not None:
+                return derived()
+            lookup = self._resolve(name)
+        return lookup()
+
+    def derived(self, func):
+        """Register `func(settings)` as a value read like a setting, by its name.
+
+        The result is memoized, and `func` is called again only once a setting
+        it read has changed.
+        """
+        name = func.__name__
+        if name in self.defaults or name in self._derived:
+            raise ImproperlyConfigured(f"{name} is already a setting")
+
+        self._derived[name] = Derived(self, func)
+        return func
+
+    async def aget(self, name):
+        """Return the value of setting `name` without blocking the event loop."""
+        lookup = self._lookups.get(name)
+        if lookup is None:
+            derived = self._derived.get(name)
+            if derived is not None:
+                # It reads settings synchronously, so it may block
+                return await run_in_executor(derived)
+            lookup = await run_in_executor(self._resolve, name)
+        return await lookup.acall()
+
+    async def aload_all(self):
+        """Return a dict of every setting and derived value, looked up concurrently."""
+        if not self._init:
+            await run_in_executor(self._setup, self.defaults, self.prefix)
+
+        keys = [*self.defaults, *self._derived]
+        values = await asyncio.gather(*(self.aget(key) for key in keys))
+        return dict(zip(keys, values))
+
+    def prefetch_secrets(self, max_workers=8):
+        """Look up every secret referenced by a setting, in parallel.
+
+        Each unique placeholder key is fetched once across `secrets_managers`
+        in a pool of up to `max_workers` threads, filling the managers' caches
+        before the first request needs them. Returns a dict of secret key to
+        `SecretPrefetch` with the lookup time and any error raised.
+        """
         if not self._init:
             self._setup(self.defaults, self.prefix)
 
-        if name in self._lookups:
-            return self._lookups[name]()
+        if not self.secrets_managers:
+            return {}
 
-        raise AttributeError(f"No setting {name}")
+        keys = {}
+        for scanner in self._scanners.values():
+            keys.update(dict.fromkeys(scanner._secret_keys(scanner.value_func())))
+
+        scanner = SecretScanner(
+            None,
+            self.secrets_managers,
+            metrics=self.metrics,
+            concurrent=self.concurrent_managers,
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = pool.map(lambda key: _prefetch_secret(scanner, key), keys)
+            return {result.key: result for result in results}
+
+    def warm(self, max_workers=8):
+        """Resolve every setting, fetching its secrets and filling caches.
+
+        Returns the `prefetch_secrets` report.
+        """
+        report = self.prefetch_secrets(max_workers=max_workers)
+        for key in self.defaults:
+            getattr(self, key)
+        return report
+
+    def stats(self):
+        """Return recorded metrics and the secrets managers' cache info."""
+        stats = {} if self.metrics is None else self.metrics.snapshot()
+        stats["secret_caches"] = [
+            {"manager": type(sm).__name__, **sm.cache_info()._asdict()}
+            for sm in self.secrets_managers
+            if hasattr(sm, "cache_info")
+        ]
+        return stats
+
+    def validate_all(self, schema):
+        """Check every `{key: validate_func}` in `schema` at once.
+
+        Raises a single `ImproperlyConfigured` listing every value that fails
+        its `validate_func`, or can't be read.
+        """
+        failures = []
+        for key, validate_func in schema.items():
+            try:
+                value = getattr(self, key)
+            except (AttributeError, ImproperlyConfigured) as e:
+                failures.append(f"{key}: {e}")
+                continue
+            if not validate_func(value):
+                failures.append(f"{key}={value} not supported.")
+
+        if failures:
+            raise ImproperlyConfigured("\n".join(failures))
 
     def __dir__(self):
-        return list(self.defaults)
+        return [*self.defaults, *self._derived]
 
     def _setup(self, defaults, prefix):
+        """Resolve the lookup for every key in `defaults`."""
         if self._init:
             return
 
-        for key, default in defaults.items():
+        with self._lock:
+            for key in defaults:
+                if key not in self._lookups:
+                    self._lookups[key] = self._build_lookup(key, defaults[key], prefix)
 
-            for LoaderClass in self.loaders:
-                # Find the first loader that supports the key
-                loader = LoaderClass(prefix, key)
-                if loader.has_key():  # noqa: W601
-                    break
-            else:
-                loader = None
+            self._init = True
+            self._save_warm_start()
+
+    def _resolve(self, key):
+        """Return the lookup for `key`, finding its loader on first use."""
+        if key not in self.defaults:
+            raise AttributeError(f"No setting {key}")
 
-            if loader is not None:
-                self._lookups[key] = SecretScanner(
-                    loader.get_value, self.secrets_managers
+        with self._lock:
+            if key not in self._lookups:
+                self._lookups[key] = self._build_lookup(
+                    key, self.defaults[key], self.prefix
                 )
+                if len(self._lookups) == len(self.defaults):
+                    self._save_warm_start()
+            return self._lookups[key]
+
+    def _warm_start_data(self):
+        """Return the `(owners, values)` of the warm start file."""
+        if self._warm is None:
+            if self.warm_start is None:
+                self._warm = ({}, {})
             else:
-                # No loader found -> use the Settings default value
-                self._lookups[key] = SecretScanner(
-                    # Build a closure for current value of default
-                    (lambda d: lambda: d)(default),
-                    self.secrets_managers,
+                self._warm = self.warm_start.load(
+                    fingerprint(self.prefix, self.defaults, self.loaders)
                 )
+        return self._warm
+
+    def _save_warm_start(self):
+        if self.warm_start is None or self._warm_saved or self._not_ready:
+            return
+
+        # Keys of dynamic loaders, which are read in bulk rather than per key
+        keys_by_loader = {}
+        for key in self._scanners:
+            owner = self._owners.get(key)
+            if owner is not None:
+                keys_by_loader.setdefault(owner, []).append(key)
+
+        loaders = {
+            loader_name(LoaderClass): LoaderClass for LoaderClass in self.loaders
+        }
+        values = {}
+        for owner, keys in keys_by_loader.items():
+            bulk_values = getattr(loaders[owner], "bulk_values", None)
+            if bulk_values is None:
+                continue
+            try:
+                found = bulk_values(self.prefix, keys)
+            except LoaderNotReady:
+                return
+            # Only values without secrets are written to disk
+            values.update(
+                (key, value)
+                for key, value in found.items()
+                if not _has_placeholder(value)
+            )
+
+        self.warm_start.save(
+            fingerprint(self.prefix, self.defaults, self.loaders),
+            self._owners,
+            values,
+        )
+        self._warm_saved = True
+
+    def _build_lookup(self, key, default, prefix):
+        """Return the cheapest lookup for `key`.
+
+        Values that cannot change after setup (the default, or from a `static`
+        loader) are read once. Without placeholders to resolve they are stored
+        as plain attributes, so reading them doesn't reach `__getattr__`,
+        unless `metrics` needs to count the reads.
+        """
+        if self.metrics is None:
+            return self._find_lookup(key, default, prefix)
+
+        start = time.perf_counter()
+        lookup = self._find_lookup(key, default, prefix)
+        self.metrics.record_latency("setup", prefix, time.perf_counter() - start)
+        return InstrumentedLookup(lookup, f"{prefix}_{key}", self.metrics)
+
+    def _find_loader(self, key, prefix):
+        """Return the first loader that supports `key`, or None."""
+        for LoaderClass in self.loaders:
+            try:
+                if self._owns(LoaderClass, key, prefix):
+                    return LoaderClass(prefix, key)
+            except LoaderNotReady:
+                # Don't remember what's found, it may be the wrong loader
+                self._not_ready = True
+                owners, _ = self._warm_start_data()
+                if owners.get(key) == loader_name(LoaderClass):
+                    # It owned the key last time, serve its last value
+                    return LoaderClass(prefix, key)
+        return None
+
+    def _owns(self, LoaderClass, key, prefix):
+        bulk_has_keys = _bulk_has_keys(LoaderClass)
+        if bulk_has_keys is None:
+            return LoaderClass(prefix, key).has_key()
+
+        if LoaderClass not in self._owned:
+            self._owned[LoaderClass] = set(bulk_has_keys(prefix, list(self.defaults)))
+        return key in self._owned[LoaderClass]
+
+    def _find_lookup(self, key, default, prefix):
+        loader = self._find_loader(key, prefix)
+        self._owners[key] = None if loader is None else loader_name(type(loader))
+
+        if loader is None:
+            # No loader found -> use the Settings default value
+            value_func, avalue_func = (lambda: default), None
+        elif loader.static:
+            value = loader.get_value()
+            value_func, avalue_func = (lambda: value), None
+        else:
+            value_func, avalue_func = loader.get_value, loader.aget_value
+            if self.warm_start is not None:
+                fallback = self._warm_start_data()[1].get(key, default)
+                value_func = _unless_not_ready(value_func, fallback)
+                avalue_func = _aunless_not_ready(avalue_func, fallback)
+            if self.metrics is not None:
+                name = type(loader).__name__
+                value_func = self.metrics.timed("loader", name, value_func)
+                avalue_func = self.metrics.atimed("loader", name, avalue_func)
+
+        scanner = SecretScanner(
+            value_func,
+            self.secrets_managers,
+            avalue_func,
+            self.metrics,
+            self.concurrent_managers,
+        )
+
+        coercer = self._coercers.get(key)
+        if loader is None and key in self._coerced_defaults:
+            coercer = None
+
+        if avalue_func is None:
+            value = value_func()
+            if not scanner._secret_keys(value):
+                if coercer is not None:
+                    value = coerce(key, value, coercer)
+
+                if (
+                    self.metrics is not None
+                    or key in self.__dict__
+                    or hasattr(type(self), key)
+                ):
+                    # Reads must be counted, or can't be shadowed by an attribute
+                    return StaticValue(value)
+
+                self.__dict__[key] = value
+                self._stored.add(key)
+                return StaticValue(value)
+
+        self._scanners[key] = scanner
+        lookup = scanner
+        if coercer is not None:
+            lookup = CoercedLookup(scanner, key, coercer)
+            # Surface an invalid value on setup, rather than on some later read
+            lookup()
+
+        ttl = self._cache_ttl(key)
+        if ttl:
+            return CachedLookup(lookup, ttl, self.refresh_ahead)
+        return lookup
+
+    def _cache_ttl(self, key):
+        if isinstance(self.cache_ttl, dict):
+            return self.cache_ttl.get(key)
+        return self.cache_ttl
+
 
-        self._init = True
+def _bulk_has_keys(LoaderClass):
+    """Return `LoaderClass.bulk_has_keys`, unless a subclass overrides `has_key`."""
+    for klass in LoaderClass.__mro__:
+        if "bulk_has_keys" in vars(klass):
+            return LoaderClass.bulk_has_keys
+        if "has_key" in vars(klass):
+            return None
+    return None
+
+
+def _unless_not_ready(value_func, fallback):
+    """Wrap `value_func` to return `fallback` while its loader isn't ready."""
+
+    def value():
+        try:
+            return value_func()
+        except LoaderNotReady:
+            return fallback
+
+    return value
+
+
+def _aunless_not_ready(avalue_func, fallback):
+    async def avalue():
+        try:
+            return await avalue_func()
+        except LoaderNotReady:
+            return fallback
+
+    return avalue
+
+
+Template = namedtuple("Template", ["parts", "keys"])
+
+
+@functools.lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile(value):
+    """Parse `value` into literal text and the secret keys between it.
+
+    `parts` holds literals at even indices and keys at odd ones, `keys` each
+    distinct key once, in order.
+    """
+    parts = SECRET_KEY_RE.split(value)
+    for i in range(1, len(parts), 2):
+        parts[i] = parts[i][2:-2]
+    return Template(tuple(parts), tuple(dict.fromkeys(parts[1::2])))
+
+
+def _template(value):
+    """Return the compiled template of `value`, or None if it isn't a string."""
+    if not isinstance(value, str):
+        return None
+    return _compile(value)
+
+
+def _has_placeholder(value):
+    template = _template(value)
+    return template is not None and bool(template.keys)
+
+
+SecretPrefetch = namedtuple("SecretPrefetch", ["key", "found", "seconds", "error"])
+
+
+def _prefetch_secret(scanner, key):
+    start = time.perf_counter()
+    try:
+        found = scanner.get_secret(key) != ""
+        error = None
+    except Exception as e:
+        found = False
+        error = e
+    return SecretPrefetch(key, found, time.perf_counter() - start, error)
+
+
+class StaticValue:
+    """Lookup for a value that never changes."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self):
+        return self.value
+
+    async def acall(self):
+        return self.value
+
+
+_NOT_MEMOIZED = object()
 
 
 class SecretScanner:
-    def __init__(self, value_func, secrets_managers=None):
+    def __init__(
+        self,
+        value_func,
+        secrets_managers=None,
+        avalue_func=None,
+        metrics=None,
+        concurrent=False,
+    ):
+        """
+        `avalue_func` is an awaitable version of `value_func`, if not given
+        `value_func` is assumed to be cheap and called directly. `metrics`
+        records the latency of each secrets manager lookup.
+
+        With `concurrent`, every manager is queried at once and the answer of
+        the first in the list that has the secret is used, as soon as every
+        manager before it has missed or run out of its `timeout`.
+        """
         self.value_func = value_func
+        self.avalue_func = avalue_func
         self.secrets_managers = secrets_managers or []
+        self.metrics = metrics
+        self.concurrent = concurrent
+
+        # (raw value, manager generation, resolved value, expires at) of the
+        # last fully resolved string, reused while neither the raw value nor
+        # any manager's cached secrets have changed.
+        self._memo = (None, None, None, None)
+        self._memo_ttl = min(
+            (sm.ttl for sm in self.secrets_managers if sm.ttl is not None),
+            default=None,
+        )
+        self._warned = False
 
     def __call__(self):
         value = self.value_func()
 
-        if not self.secrets_managers:
-            try:
-                if SECRET_KEY_RE.match(value):
-                    logger.warning(
-                        f"Managed secret style value found, but no managers configured. {value}"
-                    )
-            except TypeError:
-                pass
+        resolved = self._memoized(value)
+        if resolved is not _NOT_MEMOIZED:
+            return resolved
+
+        keys = self._secret_keys(value)
+        if not keys:
             return value
 
-        try:
-            secret_value = SECRET_KEY_RE.sub(
-                lambda m: self.get_secret(m.group().replace("%", "")),
-                value,
-            )
-        except TypeError:
-            # Value wasn't suitable for regex'ing
+        generation = BaseSecretManager.generation
+        if len(keys) == 1:
+            secrets = {keys[0]: self.get_secret(keys[0])}
+        else:
+            secrets = self.get_secrets(keys)
+        return self._substitute(value, secrets, generation)
+
+    async def acall(self):
+        if self.avalue_func is None:
+            value = self.value_func()
+        else:
+            value = await self.avalue_func()
+
+        resolved = self._memoized(value)
+        if resolved is not _NOT_MEMOIZED:
+            return resolved
+
+        keys = self._secret_keys(value)
+        if not keys:
             return value
 
+        generation = BaseSecretManager.generation
+        return self._substitute(value, await self.aget_secrets(keys), generation)
+
+    def _memoized(self, value):
+        """Return the memoized resolution of `value`, or `_NOT_MEMOIZED`."""
+        # Read once, another thread may swap the memo at any time
+        memo_value, memo_generation, resolved, expires_at = self._memo
+        if (
+            memo_value == value
+            and memo_generation == BaseSecretManager.generation
+            and (expires_at is None or time.monotonic() < expires_at)
+        ):
+            return resolved
+        return _NOT_MEMOIZED
+
+    def _secret_keys(self, value):
+        """Return the secret keys to look up for `value`."""
+        template = _template(value)
+        if template is None:
+            return []
+
+        if not self.secrets_managers:
+            # Only a value starting with a placeholder is worth a warning
+            if not self._warned and template.keys and template.parts[0] == "":
+                logger.warning(
+                    f"Managed secret style value found, but no managers configured. {value}"
+                )
+                self._warned = True
+            return []
+
+        if not template.keys:
+            # Nothing to substitute, remember that without looking anything up
+            self._memo = (value, BaseSecretManager.generation, value, None)
+        return list(template.keys)
+
+    def _substitute(self, value, secrets, generation):
+        missing = [key for key, secret in secrets.items() if secret == ""]
+        if missing:
+            logger.warning(
+                f"Managed secret empty or not found in any manager: "
+                f"{', '.join(missing)}. {value}"
+            )
+
+        parts = list(_compile(value).parts)
+        parts[1::2] = [secrets[key] for key in parts[1::2]]
+        secret_value = "".join(parts)
+
         if secret_value == "":
-            logger.warning(f"Managed secret empty or not found in any manager. {value}")
             return value
+
+        if not missing:
+            expires_at = None
+            if self._memo_ttl is not None:
+                expires_at = time.monotonic() + self._memo_ttl
+            self._memo = (value, generation, secret_value, expires_at)
         return secret_value
 
+    def _timed(self, sm, func):
+        if self.metrics is None:
+            return func
+        return self.metrics.timed("secrets_manager", type(sm).__name__, func)
+
+    def _atimed(self, sm, func):
+        if self.metrics is None:
+            return func
+        return self.metrics.atimed("secrets_manager", type(sm).__name__, func)
+
     def get_secret(self, key):
         """return value from first matching secrets_manager or '' if non-existent."""
-        for sm in self.secrets_managers:
-            val = sm.get_secret(key)
+        if self.concurrent:
+            answers = self._concurrently(lambda sm: self._timed(sm, sm.get_secret)(key))
+        else:
+            answers = (
+                self._timed(sm, sm.get_secret)(key) for sm in self.secrets_managers
+            )
+
+        for val in answers:
             if val is not None:
                 return val
         return ""
+
+    def get_secrets(self, keys):
+        """return dict of values from first matching secrets_manager or '' if non-existent."""
+        secrets = dict.fromkeys(keys, "")
+        remaining = list(secrets)
+
+        if self.concurrent:
+            # Every manager is asked for every key, nothing is known to be found yet
+            answers = self._concurrently(
+                lambda sm: self._timed(sm, sm.get_secrets)(list(secrets))
+            )
+            for found in answers:
+                remaining = _merge_secrets(secrets, remaining, found)
+                if not remaining:
+                    break
+            return secrets
+
+        for sm in self.secrets_managers:
+            if not remaining:
+                break
+            found = self._timed(sm, sm.get_secrets)(remaining)
+            remaining = _merge_secrets(secrets, remaining, found)
+        return secrets
+
+    async def aget_secrets(self, keys):
+        """Async `get_secrets`, each manager looks up its keys concurrently."""
+        secrets = dict.fromkeys(keys, "")
+        remaining = list(secrets)
+
+        if self.concurrent:
+            answers = self._aconcurrently(
+                lambda sm: self._atimed(sm, sm.aget_secrets)(list(secrets))
+            )
+            async for found in answers:
+                remaining = _merge_secrets(secrets, remaining, found)
+                if not remaining:
+                    break
+            await answers.aclose()
+            return secrets
+
+        for sm in self.secrets_managers:
+            if not remaining:
+                break
+            found = await self._atimed(sm, sm.aget_secrets)(remaining)
+            remaining = _merge_secrets(secrets, remaining, found)
+        return secrets
+
+    def _concurrently(self, call):
+        """Yield `call(sm)` for each manager in order, calling them all at once.
+
+        A manager that hasn't answered within its `timeout` yields None.
+        """
+        start = time.monotonic()
+        futures = [
+            _get_manager_pool(sm).submit(call, sm) for sm in self.secrets_managers
+        ]
+        try:
+            for sm, future in zip(self.secrets_managers, futures):
+                try:
+                    yield future.result(_time_left(sm, start))
+                except FuturesTimeoutError:
+                    logger.warning(f"{type(sm).__name__} timed out after {sm.timeout}s")
+                    yield None
+        finally:
+            for future in futures:
+                future.cancel()
+
+    async def _aconcurrently(self, call):
+        """Async `_concurrently`."""
+        start = time.monotonic()
+        tasks = [asyncio.ensure_future(call(sm)) for sm in self.secrets_managers]
+        try:
+            for sm, task in zip(self.secrets_managers, tasks):
+                try:
+                    yield await asyncio.wait_for(task, _time_left(sm, start))
+                except asyncio.TimeoutError:
+                    logger.warning(f"{type(sm).__name__} timed out after {sm.timeout}s")
+                    yield None
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def _time_left(sm, start):
+    """Return the seconds left of `sm.timeout` since `start`, None without one."""
+    if sm.timeout is None:
+        return None
+    return max(0, start + sm.timeout - time.monotonic())
+
+
+def _merge_secrets(secrets, remaining, found):
+    """Fill `secrets` with the values `found`, return the keys still missing."""
+    found = found or {}
+    for key in remaining:
+        if found.get(key) is not None:
+            secrets[key] = found[key]
+    return [key for key in remaining if found.get(key) is None]
@@ -0,0 +1,22 @@
+import asyncio
+import functools
+
+
+async def run_in_executor(func, *args):
+    """Run the blocking `func(*args)` in the event loop's default executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(func, *args))
+
+
+def run_sync(coro):
+    """Run `coro` to completion from synchronous code outside an event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    coro.close()
+    raise RuntimeError(
+        "Async lookups cannot be run synchronously inside an event loop, "
+        "use `await settings.aget(...)` instead."
+    )
@@ -1,8 +1,38 @@
+from .aio import run_in_executor, run_sync
+
+
+class LoaderNotReady(Exception):
+    """Raised by a loader whose source isn't available yet, e.g. early in boot."""
+
+
 class BaseLoader:
+    """Base for loaders of `<PREFIX>_<KEY>` values.
+
+    A loader is created per key, and the first one whose `has_key()` is true
+    owns the key. Loaders that can check many keys at once may also define a
+    classmethod `bulk_has_keys(prefix, keys)` returning the set of keys they
+    own, which Settings then calls once for all of its keys instead.
+
+    Dynamic loaders that can read many values at once may define a classmethod
+    `bulk_values(prefix, keys)` returning a dict of key to value, used to
+    record last values in a warm start file.
+    """
+
+    # Loaders whose values never change after setup set this, their values are
+    # then read once instead of on every access.
+    static = False
+
     def __init__(self, prefix, key):
         self.prefix = prefix
         self.key = key
 
+    @classmethod
+    def reset(cls, prefix):
+        """Forget anything cached for `prefix`.
+
+        Called when a Settings object for `prefix` is created or reconfigured.
+        """
+
     @property
     def flat_key(self):
         return f"{self.prefix}_{self.key}"
@@ -12,3 +42,21 @@ class BaseLoader:
 
     def get_value(self):
         raise NotImplementedError
+
+    async def aget_value(self):
+        """Return the value without blocking the event loop.
+
+        Runs `get_value` in the default executor, loaders with a native async
+        lookup should subclass `AsyncBaseLoader` instead.
+        """
+        return await run_in_executor(self.get_value)
+
+
+class AsyncBaseLoader(BaseLoader):
+    """Base for loaders whose lookup is a coroutine, implement `aget_value`."""
+
+    async def aget_value(self):
+        raise NotImplementedError
+
+    def get_value(self):
+        return run_sync(self.aget_value())
@@ -1,23 +1,187 @@
+import asyncio
 import logging
 
+from .aio import run_in_executor, run_sync
+from .cache import SecretCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+
 logger = logging.getLogger(__name__)
 
 
 class BaseSecretManager:
-    def __init__(self, ignore_errors=False, fail_on_error=True):
+    # Bumped whenever any manager's cached secrets change, so that resolved
+    # values memoized by `SecretScanner` are resolved again.
+    generation = 0
+
+    # Seconds a secret may be reused for before it is looked up again, None
+    # if secrets do not expire.
+    ttl = None
+
+    # Seconds to wait for an answer when managers are queried concurrently,
+    # after which the manager is treated as not having the secret.
+    timeout = None
+
+    # Most last found values kept to serve while the circuit breaker is open
+    last_good_maxsize = 1024
+
+    def __init__(
+        self,
+        ignore_errors=False,
+        fail_on_error=True,
+        *,
+        timeout=None,
+        circuit_breaker=None,
+    ):
+        """
+        Backend lookups go through `circuit_breaker`, by default a
+        `CircuitBreaker()`. While it is open the backend isn't called, and the
+        last value found for a key is returned instead. Keys never found are
+        failed lookups. Managers with their own cache keep serving it.
+        """
         self.ignore_errors = ignore_errors
         self.fail_on_error = fail_on_error
+        self.timeout = timeout
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+        # The last value found for each key, served while the breaker is open
+        self._last_good = SecretCache(maxsize=self.last_good_maxsize)
 
     def get_secret(self, key):
         """Return the secret value if found or None."""
         try:
-            return self.do_get_secret(key)
+            return self._lookup(key)
+        except CircuitOpenError:
+            return self._last_good_secret(key)
+        except Exception:
+            return self._handle_error()
+
+    def _lookup(self, key):
+        """Look `key` up, with the backend call guarded by the breaker.
+
+        Managers with their own cache override this to guard only the fetch
+        from their backend, so that cached answers are served while it's open.
+        """
+        return self._through_breaker(self.do_get_secret, key)
+
+    def _through_breaker(self, fetch, key):
+        """Return `fetch(key)`, raising `CircuitOpenError` while the breaker is open."""
+        if not self.circuit_breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker open, not looking up {key}")
+
+        try:
+            value = fetch(key)
         except Exception:
-            if not self.ignore_errors:
-                logger.exception(f"Secret lookup failed in {self.__class__}")
-            if self.fail_on_error:
-                raise
-            return None
+            self.circuit_breaker.record_failure()
+            raise
+
+        self._found({key: value})
+        return value
 
     def do_get_secret(self, key):
         raise NotImplementedError
+
+    def get_secrets(self, keys):
+        """Return a dict of each of `keys` to its secret value or None."""
+        keys = list(dict.fromkeys(keys))
+        if not self._batches():
+            # Errors are handled for each key by `get_secret`
+            return {key: self.get_secret(key) for key in keys}
+
+        if not self.circuit_breaker.allow():
+            return {key: self._last_good_secret(key) for key in keys}
+
+        try:
+            secrets = self.do_get_secrets(keys)
+        except Exception:
+            self.circuit_breaker.record_failure()
+            self._handle_error()
+            secrets = {}
+        else:
+            self._found(secrets)
+        return {key: secrets.get(key) for key in keys}
+
+    def do_get_secrets(self, keys):
+        """Look up several secrets in one batch.
+
+        Not implemented by default, `get_secrets` then looks each key up with
+        `get_secret`. An exception raised here counts as a failed lookup of
+        every key.
+        """
+        return {key: self.get_secret(key) for key in keys}
+
+    def _batches(self):
+        return type(self).do_get_secrets is not BaseSecretManager.do_get_secrets
+
+    async def aget_secret(self, key):
+        """Return the secret value if found or None, without blocking the loop."""
+        return await run_in_executor(self.get_secret, key)
+
+    async def aget_secrets(self, keys):
+        """Async `get_secrets`, keys are looked up concurrently unless batched."""
+        if self._batches():
+            return await run_in_executor(self.get_secrets, keys)
+
+        keys = list(dict.fromkeys(keys))
+        found = await asyncio.gather(*(self.aget_secret(key) for key in keys))
+        return dict(zip(keys, found))
+
+    def _found(self, secrets):
+        """Record a successful lookup of `secrets`."""
+        self.circuit_breaker.record_success()
+        for key, value in secrets.items():
+            if value is not None:
+                self._last_good.set(key, value)
+
+    def _last_good_secret(self, key):
+        """Return the last value found for `key`, while the breaker is open."""
+        found, value = self._last_good.peek(key)
+        if found:
+            return value
+
+        try:
+            raise CircuitOpenError(f"Circuit breaker open, no value for {key}")
+        except CircuitOpenError:
+            return self._handle_error()
+
+    def _handle_error(self):
+        if not self.ignore_errors:
+            logger.exception(f"Secret lookup failed in {self.__class__}")
+        if self.fail_on_error:
+            raise
+        return None
+
+    def invalidate_secret(self, key):
+        """Forget any cached value for `key`."""
+        self._last_good.invalidate(key)
+        self._bump_generation()
+
+    def flush_secret_cache(self):
+        """Forget all cached secrets."""
+        self._last_good.clear()
+        self._bump_generation()
+
+    def _bump_generation(self, *args):
+        BaseSecretManager.generation += 1
+
+
+class AsyncBaseSecretManager(BaseSecretManager):
+    """Base for managers whose lookup is a coroutine, implement `ado_get_secret`."""
+
+    async def aget_secret(self, key):
+        if not self.circuit_breaker.allow():
+            return self._last_good_secret(key)
+
+        try:
+            value = await self.ado_get_secret(key)
+        except Exception:
+            self.circuit_breaker.record_failure()
+            return self._handle_error()
+
+        self._found({key: value})
+        return value
+
+    async def ado_get_secret(self, key):
+        raise NotImplementedError
+
+    def do_get_secret(self, key):
+        return run_sync(self.ado_get_secret(key))
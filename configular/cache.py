@@ -0,0 +1,218 @@
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict, namedtuple
+
+from .fork import after_fork
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Every CachedLookup and SecretCache, to reset their locks after a fork
+_cached_lookups = weakref.WeakSet()
+_secret_caches = weakref.WeakSet()
+
+
+class CachedLookup:
+    """Serve a lookup from memory, re-reading it at most every `ttl` seconds.
+
+    Once the cached value is older than `refresh_ahead * ttl`, the next read
+    starts a background refresh and still returns the cached value. Reads only
+    wait on the lookup when nothing is cached or the value is older than `ttl`.
+    """
+
+    def __init__(self, lookup, ttl, refresh_ahead=0.75):
+        self.lookup = lookup
+        self.ttl = ttl
+        self.refresh_after = ttl * refresh_ahead
+
+        # (value, fetched_at), swapped as a whole so reads need no lock
+        self._entry = (_MISSING, 0.0)
+        self._refreshing = threading.Lock()
+        self._refresh_thread = None
+        _cached_lookups.add(self)
+
+    def __call__(self):
+        value = self._cached()
+        if value is _MISSING:
+            value = self.lookup()
+            self._entry = (value, time.monotonic())
+        return value
+
+    async def acall(self):
+        value = self._cached()
+        if value is _MISSING:
+            value = await self.lookup.acall()
+            self._entry = (value, time.monotonic())
+        return value
+
+    def _cached(self):
+        """Return the cached value, or `_MISSING` if it must be looked up."""
+        value, fetched_at = self._entry
+        age = time.monotonic() - fetched_at
+
+        if value is _MISSING or age >= self.ttl:
+            return _MISSING
+
+        if age >= self.refresh_after and self._refreshing.acquire(blocking=False):
+            self._refresh_thread = threading.Thread(target=self._refresh, daemon=True)
+            self._refresh_thread.start()
+
+        return value
+
+    def _refresh(self):
+        try:
+            value = self.lookup()
+            self._entry = (value, time.monotonic())
+        except Exception:
+            # Keep serving the cached value, the next read past ttl retries
+            logger.exception("Background refresh of a cached setting failed")
+        finally:
+            self._refreshing.release()
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class SecretCache:
+    """Bounded LRU cache of secret lookups.
+
+    Found values expire after `ttl` seconds (never if `ttl` is None) and misses
+    after `negative_ttl`. An expired value is still returned for up to
+    `stale_ttl` more seconds while a single background fetch replaces it.
+    Concurrent lookups of an uncached key share one fetch.
+
+    `on_change(key)` is called whenever a fetch replaces a value with a
+    different one.
+    """
+
+    def __init__(
+        self, maxsize=1024, ttl=None, negative_ttl=60, stale_ttl=0, on_change=None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.on_change = on_change
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (value, expires_at), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}
+        self._refreshing = set()
+        _secret_caches.add(self)
+
+    def get(self, key, fetch):
+        """Return the cached value for `key`, calling `fetch(key)` if needed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            value, expires_at = entry
+            now = time.monotonic()
+            if expires_at is None or now < expires_at:
+                self.hits += 1
+                return value
+            if value is not None and now < expires_at + self.stale_ttl:
+                self.hits += 1
+                self._refresh(key, fetch)
+                return value
+
+        self.misses += 1
+        return self._load(key, fetch)
+
+    def peek(self, key):
+        """Return `(True, value)` if `key` is cached and fresh, else `(False, None)`.
+
+        Never fetches, for serving hits before fetching the rest elsewhere.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and (entry[1] is None or time.monotonic() < entry[1]):
+            self.hits += 1
+            return True, entry[0]
+        return False, None
+
+    def set(self, key, value):
+        ttl = self.ttl if value is not None else self.negative_ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        if previous is not None and previous[0] != value and self.on_change:
+            self.on_change(key)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def _load(self, key, fetch):
+        with self._lock:
+            loading = self._loading.setdefault(key, threading.Lock())
+
+        with loading:
+            # Another thread may have fetched it while this one waited
+            with self._lock:
+                entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or time.monotonic() < entry[1]):
+                return entry[0]
+
+            try:
+                value = fetch(key)
+                self.set(key, value)
+                return value
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+    def _refresh(self, key, fetch):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.set(key, fetch(key))
+            except Exception:
+                # Keep serving the stale value until it runs out
+                logger.exception(f"Background refresh of secret {key} failed")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+@after_fork
+def _after_fork():
+    for lookup in list(_cached_lookups):
+        lookup._refreshing = threading.Lock()
+        lookup._refresh_thread = None
+
+    for cache in list(_secret_caches):
+        cache._lock = threading.Lock()
+        cache._loading = {}
+        cache._refreshing = set()
@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+import weakref
+
+from .fork import after_fork
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Every CircuitBreaker, to reset their locks after a fork
+_instances = weakref.WeakSet()
+
+
+class CircuitOpenError(Exception):
+    """Raised for a lookup refused because the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Stop calling a backend after repeated failures.
+
+    After `failure_threshold` consecutive failures the breaker opens and calls
+    are refused. Once `reset_timeout` seconds have passed a single probe call
+    is let through (half-open): if it succeeds the breaker closes, otherwise it
+    opens again for twice as long, up to `max_reset_timeout`. A
+    `failure_threshold` of None never opens the breaker. A probe that hasn't
+    finished within the current timeout is replaced by another.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=1.0, max_reset_timeout=60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+
+        self.state = CLOSED
+        self.failures = 0
+        self._timeout = reset_timeout
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+        _instances.add(self)
+
+    def allow(self):
+        """Return whether a call may go to the backend now."""
+        if self.state == CLOSED:
+            return True
+
+        with self._lock:
+            now = time.monotonic()
+            if (self.state == OPEN and now >= self._opened_at + self._timeout) or (
+                self.state == HALF_OPEN and now >= self._probe_at + self._timeout
+            ):
+                # This caller is the probe, everyone else is still refused
+                self.state = HALF_OPEN
+                self._probe_at = now
+                return True
+            return self.state == CLOSED
+
+    def record_success(self):
+        if self.state == CLOSED and not self.failures:
+            return
+
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("Circuit breaker closed, backend recovered")
+            self.state = CLOSED
+            self.failures = 0
+            self._timeout = self.reset_timeout
+
+    def record_failure(self):
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+                self._open()
+                return
+
+            self.failures += 1
+            if (
+                self.state == CLOSED
+                and self.failure_threshold is not None
+                and self.failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        logger.warning(
+            f"Circuit breaker open after {self.failures} failures, "
+            f"retrying in {self._timeout}s"
+        )
+
+
+@after_fork
+def _after_fork():
+    for breaker in list(_instances):
+        breaker._lock = threading.Lock()
@@ -0,0 +1,134 @@
+import json
+import re
+from datetime import timedelta
+
+from .exceptions import ImproperlyConfigured
+
+TRUE_STRINGS = {"1", "true", "t", "yes", "y", "on"}
+FALSE_STRINGS = {"0", "false", "f", "no", "n", "off", ""}
+
+DURATION_UNITS = {
+    "ms": 0.001,
+    "s": 1,
+    "m": 60,
+    "h": 60 * 60,
+    "d": 24 * 60 * 60,
+    "w": 7 * 24 * 60 * 60,
+}
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(ms|s|m|h|d|w)")
+DURATION_FULL_RE = re.compile(r"(?:\d+(?:\.\d+)?\s*(?:ms|s|m|h|d|w)\s*)+")
+
+_MISSING = object()
+
+
+def to_bool(value):
+    """`"true"`, `"yes"`, `"on"`, `"1"` and their opposites, in any case."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        if value.strip().lower() in TRUE_STRINGS:
+            return True
+        if value.strip().lower() in FALSE_STRINGS:
+            return False
+    raise ValueError(f"{value!r} is not a boolean")
+
+
+def to_list(value):
+    """A list, a JSON list or a comma separated string."""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, str):
+        if value.lstrip().startswith("["):
+            return to_json(value)
+        return [item.strip() for item in value.split(",") if item.strip()]
+    raise ValueError(f"{value!r} is not a list")
+
+
+def to_json(value):
+    """Parse JSON strings, other values are assumed to be decoded already."""
+    if isinstance(value, (str, bytes)):
+        return json.loads(value)
+    return value
+
+
+def to_duration(value):
+    """A timedelta from seconds or a string like `"90s"`, `"1h30m"` or `"2d"`."""
+    if isinstance(value, timedelta):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return timedelta(seconds=value)
+    if isinstance(value, str):
+        value = value.strip()
+        try:
+            return timedelta(seconds=float(value))
+        except ValueError:
+            pass
+
+        if DURATION_FULL_RE.fullmatch(value):
+            return timedelta(
+                seconds=sum(
+                    float(amount) * DURATION_UNITS[unit]
+                    for amount, unit in DURATION_RE.findall(value)
+                )
+            )
+    raise ValueError(f"{value!r} is not a duration")
+
+
+# Types that need more than calling the type on the raw value
+COERCERS = {
+    bool: to_bool,
+    list: to_list,
+    dict: to_json,
+    timedelta: to_duration,
+}
+
+
+def get_coercer(type_):
+    """Return the function coercing raw values to `type_`.
+
+    `type_` may be a type, such as `int`, `bool` or `timedelta`, or any
+    function taking the raw value.
+    """
+    return COERCERS.get(type_, type_)
+
+
+def coerce(key, value, coercer):
+    """Coerce `value` for setting `key`, None is left alone."""
+    if value is None:
+        return None
+
+    try:
+        return coercer(value)
+    except (TypeError, ValueError) as e:
+        name = getattr(coercer, "__name__", repr(coercer))
+        raise ImproperlyConfigured(f"{key}={value!r} is not valid for {name}: {e}")
+
+
+class CoercedLookup:
+    """Coerce the values of a lookup, once per distinct raw value."""
+
+    def __init__(self, lookup, key, coercer):
+        self.lookup = lookup
+        self.key = key
+        self.coercer = coercer
+
+        # (raw value, coerced value) of the last read
+        self._memo = (_MISSING, None)
+
+    def _coerce(self, value):
+        memo_value, coerced = self._memo
+        # 1 == True, so the type must match too
+        if type(value) is type(memo_value) and value == memo_value:
+            return coerced
+
+        coerced = coerce(self.key, value, self.coercer)
+        self._memo = (value, coerced)
+        return coerced
+
+    def __call__(self):
+        return self._coerce(self.lookup())
+
+    async def acall(self):
+        return self._coerce(await self.lookup.acall())
@@ -1,7 +1,11 @@
 import logging
+import threading
+import time
 
 from constance import config as constance_config
+from constance import settings as constance_settings
 from django.conf import settings  # noqa: F401
+from django.core.exceptions import ImproperlyConfigured
 from django.db.utils import ProgrammingError
 
 try:
@@ -9,30 +13,251 @@ try:
 except ImportError:
     pytest = object()
 
-from .base_loader import BaseLoader
+try:
+    from constance.signals import config_updated
+except ImportError:
+    # Older django-constance versions don't send signals
+    config_updated = None
+
+from . import _registry, invalidate
+from .base_loader import BaseLoader, LoaderNotReady
+from .fork import after_fork
 
 logger = logging.getLogger(__name__)
 warn_about_constance = True
 
 
 class ConstanceLoader(BaseLoader):
-    def has_key(self):
+    """Load `<PREFIX>_<KEY>` values from Constance.
+
+    Every `<PREFIX>_*` value is fetched with a single backend `mget` the first
+    time any key for the prefix is checked, so setup costs one round trip
+    rather than one per key.
+
+    Reads are live by default. Subclasses may set `max_age` (seconds) to serve
+    reads from the prefetched values, refreshing all of them in one batch once
+    they are older than `max_age`, or `max_age = None` to serve them until a
+    value is saved. Saves in other processes are only seen with `max_age =
+    None` if `ConstancePubSub` is started in every process.
+    """
+
+    max_age = 0
+
+    # prefix -> (fetched_at, {flat_key: value}), shared by all loaders
+    _prefetched = {}
+
+    @classmethod
+    def prefetch(cls, prefix):
+        """Fetch every `<prefix>_*` Constance value in one backend round trip.
+
+        Returns a dict of flat key to value, or None if the backend is not
+        available yet.
+        """
+        flat_keys = [
+            flat_key
+            for flat_key in constance_settings.CONFIG
+            if flat_key.startswith(f"{prefix}_")
+        ]
+        values = {
+            flat_key: constance_settings.CONFIG[flat_key][0] for flat_key in flat_keys
+        }
+        try:
+            # Constance 2 yields (key, value) pairs, later versions return a dict
+            values.update(dict(constance_config._backend.mget(flat_keys)))
+        except ProgrammingError:
+            global warn_about_constance
+            if warn_about_constance:
+                logger.warning(
+                    "Settings loaded before the database is initialized. "
+                    "Constance values will not be available."
+                )
+
+            warn_about_constance = False
+            return None
+
+        cls._prefetched[prefix] = (time.monotonic(), values)
+        return values
+
+    @classmethod
+    def refresh(cls, prefix):
+        """Re-fetch every `<prefix>_*` value in one batch."""
+        return cls.prefetch(prefix)
+
+    def _values(self):
+        try:
+            fetched_at, values = self._prefetched[self.prefix]
+        except KeyError:
+            return self.prefetch(self.prefix)
+
+        if self.max_age and time.monotonic() - fetched_at > self.max_age:
+            return self.refresh(self.prefix)
+        return values
+
+    @classmethod
+    def bulk_has_keys(cls, prefix, keys):
         # If the key is in constance, the default from defaults cannot be reached
-        constance_has_key = False
+        if getattr(pytest, "_in_test", False):
+            return set()
 
-        if not getattr(pytest, "_in_test", False):
-            try:
-                constance_has_key = hasattr(constance_config, self.flat_key)
-            except ProgrammingError:
-                global warn_about_constance
-                if warn_about_constance:
-                    logger.warning(
-                        "Settings loaded before the database is initialized. "
-                        "Constance values will not be available."
-                    )
-
-                warn_about_constance = False
-        return constance_has_key
+        if prefix not in cls._prefetched:
+            cls.prefetch(prefix)
+
+        try:
+            values = cls._prefetched[prefix][1]
+        except KeyError:
+            raise LoaderNotReady("The Constance backend is not ready")
+        return {key for key in keys if f"{prefix}_{key}" in values}
+
+    @classmethod
+    def bulk_values(cls, prefix, keys):
+        """Return the prefetched values of `keys`, without a round trip."""
+        try:
+            values = cls._prefetched[prefix][1]
+        except KeyError:
+            raise LoaderNotReady(f"No Constance values prefetched for {prefix}")
+        flat_keys = {key: f"{prefix}_{key}" for key in keys}
+        return {
+            key: values[flat_key]
+            for key, flat_key in flat_keys.items()
+            if flat_key in values
+        }
+
+    def has_key(self):
+        return self.key in self.bulk_has_keys(self.prefix, [self.key])
 
     def get_value(self):
-        return getattr(constance_config, self.flat_key)
+        if self.max_age != 0:
+            values = self._values()
+            if values is not None and self.flat_key in values:
+                return values[self.flat_key]
+
+        try:
+            return getattr(constance_config, self.flat_key)
+        except ProgrammingError as e:
+            raise LoaderNotReady("The Constance backend is not ready") from e
+
+
+class ConstancePubSub:
+    """Apply Constance values saved in any process, through Redis pub/sub.
+
+    `publish` announces a saved key on `channel`, which `ConstanceLoader`
+    does for every save once `start` has been called. A listener thread
+    refreshes the prefetched values of the key's prefix, in one batch, and
+    invalidates the key of every Settings object for the prefix.
+
+    `connection` defaults to the Constance Redis backend's connection.
+    """
+
+    def __init__(self, connection=None, channel="configular:constance"):
+        if connection is None:
+            connection = getattr(constance_config._backend, "_rd", None)
+        if connection is None:
+            raise ImproperlyConfigured(
+                "ConstancePubSub needs a Redis connection, "
+                "the Constance backend does not use Redis"
+            )
+
+        self.connection = connection
+        self.channel = channel
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        global _pubsub
+        _pubsub = self
+
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._listen, name="configular-pubsub", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        global _pubsub
+        if _pubsub is self:
+            _pubsub = None
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def publish(self, flat_key):
+        try:
+            self.connection.publish(self.channel, flat_key)
+        except Exception:
+            logger.exception(f"Could not publish Constance update for {flat_key}")
+
+    def handle(self, flat_key):
+        for prefix in _prefixes(flat_key):
+            if prefix in ConstanceLoader._prefetched:
+                ConstanceLoader.refresh(prefix)
+            invalidate(prefix, flat_key.replace(f"{prefix}_", "", 1))
+
+    def _listen(self):
+        pubsub = None
+        reconnecting = False
+        while not self._stopped.is_set():
+            try:
+                if pubsub is None:
+                    pubsub = self.connection.pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.channel)
+                    if reconnecting:
+                        # Saves may have been missed while disconnected
+                        for prefix in list(ConstanceLoader._prefetched):
+                            ConstanceLoader.refresh(prefix)
+                            invalidate(prefix)
+                        reconnecting = False
+
+                message = pubsub.get_message(timeout=1.0)
+                if message is not None:
+                    flat_key = message["data"]
+                    if isinstance(flat_key, bytes):
+                        flat_key = flat_key.decode()
+                    self.handle(flat_key)
+            except Exception:
+                logger.exception("Constance pub/sub listener failed, reconnecting")
+                if pubsub is not None:
+                    pubsub.close()
+                    pubsub = None
+                reconnecting = True
+                self._stopped.wait(1.0)
+
+        if pubsub is not None:
+            pubsub.close()
+
+
+# The started ConstancePubSub, saves are published through it
+_pubsub = None
+
+
+def _prefixes(flat_key):
+    """Return the prefix of every Settings object that `flat_key` may belong to."""
+    prefixes = {config.prefix for config in list(_registry)}
+    return [prefix for prefix in prefixes if flat_key.startswith(f"{prefix}_")]
+
+
+def _config_updated(sender, key, old_value, new_value, **kwargs):
+    """Apply a saved Constance value to the prefetched values and Settings."""
+    for prefix, (fetched_at, values) in list(ConstanceLoader._prefetched.items()):
+        if key in values:
+            values[key] = new_value
+
+    # Settings may have read the key without prefetching, e.g. per key
+    for prefix in _prefixes(key):
+        invalidate(prefix, key.replace(f"{prefix}_", "", 1))
+
+    if _pubsub is not None:
+        _pubsub.publish(key)
+
+
+@after_fork
+def _after_fork():
+    # The listener thread doesn't survive the fork, start one in the child
+    if _pubsub is not None:
+        _pubsub._stopped = threading.Event()
+        _pubsub.start()
+
+
+if config_updated is not None:
+    config_updated.connect(_config_updated, dispatch_uid="configular_config_updated")
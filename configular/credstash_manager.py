@@ -1,18 +1,123 @@
-from functools import lru_cache
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 import credstash
 from credstash import ItemNotFound
 
 from .base_secret_manager import BaseSecretManager
+from .cache import SecretCache
+from .fork import after_fork
+
+# Every CredstashManager, to drop their pools after a fork
+_instances = weakref.WeakSet()
 
 
 class CredstashManager(BaseSecretManager):
-    @lru_cache(maxsize=None)
+    """Look up secrets in credstash, caching them in memory.
+
+    Up to `maxsize` secrets are cached. Found secrets are cached for `ttl`
+    seconds (forever if None) and missing ones for `negative_ttl` seconds.
+    After `ttl` a secret is served for up to `stale_ttl` more seconds while it
+    is fetched again in the background, so rotated credentials are picked up
+    without every reader waiting on KMS.
+
+    Several secrets requested together are served from the cache where
+    possible, and the rest fetched concurrently in a pool of up to
+    `max_workers` threads. `timeout` bounds the wait for a secret when the
+    Settings object queries its managers concurrently.
+    """
+
+    def __init__(
+        self,
+        ignore_errors=False,
+        fail_on_error=True,
+        *,
+        maxsize=1024,
+        ttl=None,
+        negative_ttl=60,
+        stale_ttl=0,
+        max_workers=8,
+        timeout=None,
+        circuit_breaker=None,
+    ):
+        super().__init__(
+            ignore_errors=ignore_errors,
+            fail_on_error=fail_on_error,
+            timeout=timeout,
+            circuit_breaker=circuit_breaker,
+        )
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.cache = SecretCache(
+            maxsize=maxsize,
+            ttl=ttl,
+            negative_ttl=negative_ttl,
+            stale_ttl=stale_ttl,
+            on_change=self._bump_generation,
+        )
+        self._last_good.maxsize = maxsize
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        _instances.add(self)
+
     def do_get_secret(self, key):
+        return self.cache.get(key, self._fetch_through_breaker)
+
+    def _lookup(self, key):
+        # Cached answers, including misses, are served while the breaker is open
+        return self.do_get_secret(key)
+
+    def _fetch_through_breaker(self, key):
+        return self._through_breaker(self.fetch_secret, key)
+
+    def get_secrets(self, keys):
+        secrets = {}
+        misses = []
+        for key in dict.fromkeys(keys):
+            hit, value = self.cache.peek(key)
+            if hit:
+                secrets[key] = value
+            else:
+                misses.append(key)
+
+        if len(misses) < 2:
+            secrets.update(super().get_secrets(misses))
+        else:
+            secrets.update(zip(misses, self._executor().map(self.get_secret, misses)))
+        return {key: secrets[key] for key in keys}
+
+    def _executor(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="configular-credstash",
+                    )
+        return self._pool
+
+    def fetch_secret(self, key):
         try:
             return credstash.getSecret(key)
         except ItemNotFound:
             return None
 
+    def invalidate_secret(self, key):
+        self.cache.invalidate(key)
+        super().invalidate_secret(key)
+
     def flush_secret_cache(self):
-        self.do_get_secret.cache_clear()
+        self.cache.clear()
+        super().flush_secret_cache()
+
+    def cache_info(self):
+        return self.cache.info()
+
+
+@after_fork
+def _after_fork():
+    # The pools' threads only exist in the parent
+    for manager in list(_instances):
+        manager._pool = None
+        manager._pool_lock = threading.Lock()
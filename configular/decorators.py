@@ -2,20 +2,34 @@ from functools import wraps
 
 from .exceptions import ImproperlyConfigured
 
+_NOT_VALIDATED = object()
+
 
 class validate_setting(object):
-    """Raise `ImproperlyConfigured if `config[key]` does not pass `validate_func`."""
+    """Raise `ImproperlyConfigured if `config[key]` does not pass `validate_func`.
+
+    `validate_func` is run again only when the value has changed.
+    """
 
     def __init__(self, config, key, validate_func):
         self.config = config
         self.key = key
         self.validate_func = validate_func
+        # (value, passed) of the last validation
+        self._memo = (_NOT_VALIDATED, False)
+
+    def _validate(self, value):
+        last_value, passed = self._memo
+        if last_value is not value and last_value != value:
+            passed = bool(self.validate_func(value))
+            self._memo = (value, passed)
+        return passed
 
     def __call__(self, f):
         @wraps(f)
         def wrapped_f(*args, **kwargs):
             value = getattr(self.config, self.key)
-            if not (self.validate_func(value)):
+            if not self._validate(value):
                 raise ImproperlyConfigured(f"{self.key}={value} not supported.")
             return f(*args, **kwargs)
 
@@ -0,0 +1,65 @@
+_MISSING = object()
+
+
+class Derived:
+    """A value computed from settings, recomputed only when they change.
+
+    `func` is called with a view of the Settings object that records each key
+    it reads, along with the key's version. The result is memoized until one of
+    those keys is invalidated, or, for keys served by dynamic loaders, until
+    its value differs from the one `func` read.
+    """
+
+    def __init__(self, settings, func):
+        self.settings = settings
+        self.func = func
+
+        # ({key: (version, value)}, result), swapped as a whole so reads need no lock
+        self._memo = None
+
+    def __call__(self):
+        memo = self._memo
+        if memo is not None and self._current(memo[0]):
+            return memo[1]
+
+        reads = {}
+        result = self.func(_Tracker(self.settings, reads))
+        self._memo = (reads, result)
+        return result
+
+    def _current(self, reads):
+        settings = self.settings
+        versions = settings._versions
+        for key, (version, value) in reads.items():
+            if versions[key] != version:
+                return False
+            # Static values only change when their key is invalidated
+            if key not in settings._stored:
+                current = getattr(settings, key)
+                if current is not value and current != value:
+                    return False
+        return True
+
+
+class _Tracker:
+    """Read settings, recording what was read in `reads`."""
+
+    def __init__(self, settings, reads):
+        self._settings = settings
+        self._reads = reads
+
+    def __getattr__(self, name):
+        settings = self._settings
+        derived = settings._derived.get(name)
+        if derived is not None:
+            result = derived()
+            # Depend on whatever the other derived value read
+            self._reads.update(derived._memo[0])
+            return result
+
+        # Take the version first, so an invalidation during the read is noticed
+        version = settings._versions.get(name, _MISSING)
+        value = getattr(settings, name)
+        if version is not _MISSING:
+            self._reads[name] = (version, value)
+        return value
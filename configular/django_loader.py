@@ -2,7 +2,9 @@ import logging
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 
+from . import invalidate
 from .base_loader import BaseLoader
 
 logger = logging.getLogger(__name__)
@@ -10,12 +12,27 @@ warn_about_django = True
 
 
 class DjangoLoader(BaseLoader):
-    def __init__(self, prefix, key):
-        super().__init__(prefix, key)
+    """Load values from the Django setting named by the prefix, a dict.
 
-        self.django_settings = {}
+    The dict is looked up once per prefix and shared by every key. When the
+    setting changes, e.g. with `override_settings`, it is looked up again and
+    Settings objects for the prefix are invalidated.
+    """
+
+    static = True
+
+    # prefix -> the Django setting for prefix, shared by all loaders
+    _mappings = {}
+
+    @classmethod
+    def mapping(cls, prefix):
         try:
-            self.django_settings = getattr(settings, prefix, {})
+            return cls._mappings[prefix]
+        except KeyError:
+            pass
+
+        try:
+            mapping = getattr(settings, prefix, {})
         except ImproperlyConfigured:
             global warn_about_django
             if warn_about_django:
@@ -25,9 +42,36 @@ class DjangoLoader(BaseLoader):
                 )
 
             warn_about_django = False
+            return {}
+
+        cls._mappings[prefix] = mapping
+        return mapping
+
+    @classmethod
+    def reset(cls, prefix):
+        cls._mappings.pop(prefix, None)
+
+    @classmethod
+    def bulk_has_keys(cls, prefix, keys):
+        mapping = cls.mapping(prefix)
+        return {key for key in keys if key in mapping}
+
+    @property
+    def django_settings(self):
+        return self.mapping(self.prefix)
 
     def has_key(self):
         return self.key in self.django_settings
 
     def get_value(self):
         return self.django_settings[self.key]
+
+
+def _setting_changed(sender, setting, **kwargs):
+    # The mapping may already have been reset, e.g. by another Settings object
+    # for the prefix, while values read from it are still stored.
+    DjangoLoader.reset(setting)
+    invalidate(setting)
+
+
+setting_changed.connect(_setting_changed, dispatch_uid="configular_setting_changed")
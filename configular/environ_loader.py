@@ -1,11 +1,66 @@
 import os
 
+from . import invalidate
 from .base_loader import BaseLoader
 
 
 class EnvironLoader(BaseLoader):
+    """Load `<PREFIX>_<KEY>` values from the environment.
+
+    The environment is scanned once per prefix, when a Settings object first
+    needs it, and values are served from that snapshot. Call `rescan(prefix)`
+    to pick up changes, or subclass with `live = True` to read `os.environ` on
+    every access.
+    """
+
+    live = False
+
+    # prefix -> {flat_key: value}, shared by all loaders
+    _snapshots = {}
+
+    @property
+    def static(self):
+        return not self.live
+
+    @classmethod
+    def scan(cls, prefix):
+        """Snapshot every `<prefix>_*` environment variable."""
+        snapshot = {
+            flat_key: value
+            for flat_key, value in os.environ.items()
+            if flat_key.startswith(f"{prefix}_")
+        }
+        cls._snapshots[prefix] = snapshot
+        return snapshot
+
+    @classmethod
+    def rescan(cls, prefix):
+        """Snapshot the environment again, and invalidate Settings for `prefix`."""
+        snapshot = cls.scan(prefix)
+        invalidate(prefix)
+        return snapshot
+
+    @classmethod
+    def reset(cls, prefix):
+        cls._snapshots.pop(prefix, None)
+
+    @classmethod
+    def environ(cls, prefix):
+        if cls.live:
+            return os.environ
+
+        try:
+            return cls._snapshots[prefix]
+        except KeyError:
+            return cls.scan(prefix)
+
+    @classmethod
+    def bulk_has_keys(cls, prefix, keys):
+        environ = cls.environ(prefix)
+        return {key for key in keys if f"{prefix}_{key}" in environ}
+
     def has_key(self):
-        return self.flat_key in os.environ
+        return self.flat_key in self.environ(self.prefix)
 
     def get_value(self):
-        return os.environ[self.flat_key]
+        return self.environ(self.prefix)[self.flat_key]
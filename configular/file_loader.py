@@ -0,0 +1,183 @@
+import json
+import logging
+import os
+import threading
+import time
+
+from . import invalidate
+from .base_loader import BaseLoader
+from .exceptions import ImproperlyConfigured
+from .fork import after_fork
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+
+class FileLoader(BaseLoader):
+    """Load values from config files, for example a mounted ConfigMap.
+
+    Subclass with `paths`, a list of `.json`, `.toml`, `.yaml`/`.yml` or
+    `.env` files. JSON, TOML and YAML files hold a table named by the prefix,
+    `.env` files hold `<PREFIX>_<KEY>=value` lines. Later files override
+    earlier ones, and missing files are skipped.
+
+    The files are parsed once per prefix and values are served from memory.
+    At most every `check_interval` seconds the files are `stat`ed, and parsed
+    again only if one has a new mtime or inode. If they can't be parsed, e.g.
+    while one is half written, the last values are kept until they change again.
+    """
+
+    paths = ()
+    check_interval = 5
+
+    # (loader class, prefix) -> (checked_at, stamps, {key: value})
+    _files = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def stamps(cls):
+        stamps = []
+        for path in cls.paths:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                stamps.append(None)
+            else:
+                stamps.append((stat.st_mtime_ns, stat.st_ino))
+        return stamps
+
+    @classmethod
+    def load(cls, prefix):
+        """Parse every file for `prefix`, returning a dict of key to value."""
+        values = {}
+        for path in cls.paths:
+            try:
+                values.update(parse(path, prefix))
+            except FileNotFoundError:
+                continue
+        return values
+
+    @classmethod
+    def values(cls, prefix):
+        now = time.monotonic()
+        state = cls._files.get((cls, prefix))
+        if state is not None and now - state[0] < cls.check_interval:
+            return state[2]
+
+        with cls._lock:
+            state = cls._files.get((cls, prefix))
+            if state is not None and now - state[0] < cls.check_interval:
+                return state[2]
+
+            stamps = cls.stamps()
+            if state is not None and stamps == state[1]:
+                cls._files[(cls, prefix)] = (now, stamps, state[2])
+                return state[2]
+
+            try:
+                values = cls.load(prefix)
+            except Exception:
+                if state is None:
+                    raise
+                logger.exception(
+                    f"Could not reload {cls.__name__}, keeping last values"
+                )
+                # Don't parse the broken files again until they change
+                cls._files[(cls, prefix)] = (now, stamps, state[2])
+                return state[2]
+            cls._files[(cls, prefix)] = (now, stamps, values)
+
+        if state is not None:
+            # Keys may have been added or removed
+            invalidate(prefix)
+        return values
+
+    @classmethod
+    def reset(cls, prefix):
+        cls._files.pop((cls, prefix), None)
+
+    @classmethod
+    def bulk_has_keys(cls, prefix, keys):
+        values = cls.values(prefix)
+        return {key for key in keys if key in values}
+
+    @classmethod
+    def bulk_values(cls, prefix, keys):
+        values = cls.values(prefix)
+        return {key: values[key] for key in keys if key in values}
+
+    def has_key(self):
+        return self.key in self.values(self.prefix)
+
+    def get_value(self):
+        return self.values(self.prefix)[self.key]
+
+    async def aget_value(self):
+        # Served from memory, no need for the executor
+        return self.get_value()
+
+
+@after_fork
+def _after_fork():
+    FileLoader._lock = threading.Lock()
+
+
+def parse(path, prefix):
+    """Return the `prefix` values in the file at `path`."""
+    extension = os.path.splitext(path)[1].lower()
+
+    # A file named just `.env` has no extension
+    if extension == ".env" or os.path.basename(path) == ".env":
+        with open(path) as env_file:
+            return parse_env(env_file, prefix)
+
+    if extension == ".json":
+        with open(path) as json_file:
+            data = json.load(json_file)
+    elif extension == ".toml":
+        if tomllib is None:
+            raise ImproperlyConfigured(f"tomli must be installed to load {path}")
+        with open(path, "rb") as toml_file:
+            data = tomllib.load(toml_file)
+    elif extension in (".yaml", ".yml"):
+        if yaml is None:
+            raise ImproperlyConfigured(f"PyYAML must be installed to load {path}")
+        with open(path) as yaml_file:
+            data = yaml.safe_load(yaml_file) or {}
+    else:
+        raise ImproperlyConfigured(f"Unsupported config file type {path}")
+
+    return data.get(prefix, {})
+
+
+def parse_env(lines, prefix):
+    values = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+
+        flat_key, value = line.split("=", 1)
+        flat_key = flat_key.strip()
+        if flat_key.startswith("export "):
+            flat_key = flat_key.replace("export ", "", 1).strip()
+        if not flat_key.startswith(f"{prefix}_"):
+            continue
+
+        value = value.strip()
+        if len(value) > 1 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        values[flat_key.replace(f"{prefix}_", "", 1)] = value
+    return values
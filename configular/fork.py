@@ -0,0 +1,12 @@
+import os
+
+
+def after_fork(func):
+    """Call `func()` in the child process after every fork, where supported.
+
+    Locks held by other threads at the time of a fork are never released in
+    the child, and threads don't survive it, so state holding them is reset.
+    """
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=func)
+    return func
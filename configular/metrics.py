@@ -0,0 +1,148 @@
+import random
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, defaultdict
+
+from .fork import after_fork
+
+# Every Metrics, to reset their locks after a fork
+_instances = weakref.WeakSet()
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+
+class Histogram:
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            # Cumulative, as Prometheus expects
+            "buckets": {
+                bound: sum(self.buckets[: i + 1]) for i, bound in enumerate(BUCKETS)
+            },
+        }
+
+
+class Metrics:
+    """Record how Settings objects are used.
+
+    Pass an instance as `Settings(metrics=...)` to count reads of each setting,
+    time loader and secrets manager lookups, and time setup. One instance may
+    be shared by several Settings objects. Settings created without metrics
+    pay nothing for this.
+
+    `sample_call_sites` is the fraction of reads for which the calling file
+    and line are recorded. Each callback is called as `callback(name, value,
+    tags)` for every measurement, to forward them to e.g. statsd or Prometheus.
+    """
+
+    def __init__(self, sample_call_sites=0.0, callbacks=None):
+        self.sample_call_sites = sample_call_sites
+        self.callbacks = list(callbacks or [])
+
+        self._lock = threading.Lock()
+        self._accesses = Counter()
+        self._call_sites = defaultdict(Counter)
+        self._latencies = defaultdict(Histogram)
+        _instances.add(self)
+
+    def add_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def record_access(self, flat_key, depth=1):
+        """Count a read, `depth` frames above this one being the reader."""
+        with self._lock:
+            self._accesses[flat_key] += 1
+            if self.sample_call_sites and random.random() < self.sample_call_sites:
+                frame = sys._getframe(depth)
+                call_site = f"{frame.f_code.co_filename}:{frame.f_lineno}"
+                self._call_sites[flat_key][call_site] += 1
+        self._emit("configular.access", 1, {"key": flat_key})
+
+    def record_latency(self, kind, name, seconds):
+        with self._lock:
+            self._latencies[(kind, name)].observe(seconds)
+        self._emit(f"configular.{kind}.latency", seconds, {kind: name})
+
+    def timed(self, kind, name, func):
+        """Wrap `func` to record its latency."""
+
+        def timed(*args):
+            start = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                self.record_latency(kind, name, time.perf_counter() - start)
+
+        return timed
+
+    def atimed(self, kind, name, func):
+        """Wrap the coroutine function `func` to record its latency."""
+
+        async def atimed(*args):
+            start = time.perf_counter()
+            try:
+                return await func(*args)
+            finally:
+                self.record_latency(kind, name, time.perf_counter() - start)
+
+        return atimed
+
+    def snapshot(self):
+        with self._lock:
+            latencies = defaultdict(dict)
+            for (kind, name), histogram in self._latencies.items():
+                latencies[kind][name] = histogram.snapshot()
+
+            return {
+                "accesses": dict(self._accesses),
+                "call_sites": {
+                    flat_key: dict(call_sites)
+                    for flat_key, call_sites in self._call_sites.items()
+                },
+                "latency": dict(latencies),
+            }
+
+    def _emit(self, name, value, tags):
+        for callback in self.callbacks:
+            callback(name, value, tags)
+
+
+@after_fork
+def _after_fork():
+    for metrics in list(_instances):
+        metrics._lock = threading.Lock()
+
+
+class InstrumentedLookup:
+    """Count every read of a lookup."""
+
+    def __init__(self, lookup, flat_key, metrics):
+        self.lookup = lookup
+        self.flat_key = flat_key
+        self.metrics = metrics
+
+    def __call__(self):
+        # Skip this frame and Settings.__getattr__ when sampling call sites
+        self.metrics.record_access(self.flat_key, depth=3)
+        return self.lookup()
+
+    async def acall(self):
+        self.metrics.record_access(self.flat_key, depth=3)
+        return await self.lookup.acall()
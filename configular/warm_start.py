@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def loader_name(LoaderClass):
+    if LoaderClass is None:
+        return None
+    return f"{LoaderClass.__module__}.{LoaderClass.__qualname__}"
+
+
+def fingerprint(prefix, defaults, loaders):
+    """Return a hash of what decides which loader owns each key."""
+    data = json.dumps(
+        [
+            prefix,
+            sorted((key, repr(default)) for key, default in defaults.items()),
+            [loader_name(LoaderClass) for LoaderClass in loaders],
+        ]
+    )
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class WarmStart:
+    """A file remembering which loader owns each key, and its last value.
+
+    Read when a Settings object first finds a loader not ready, and used only
+    if its fingerprint matches the Settings' prefix, defaults and loaders.
+    Written once every key has been resolved with all loaders available, if
+    anything changed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # The data last read or written, so that it isn't written again unchanged
+        self._data = None
+
+    def load(self, expected_fingerprint):
+        """Return `(owners, values)`, both empty if the file can't be used."""
+        try:
+            with open(self.path) as warm_file:
+                data = json.load(warm_file)
+        except FileNotFoundError:
+            return {}, {}
+        except (OSError, ValueError):
+            logger.warning(f"Ignoring unreadable warm start file {self.path}")
+            return {}, {}
+
+        if data.get("fingerprint") != expected_fingerprint:
+            return {}, {}
+        self._data = data
+        return dict(data.get("owners", {})), dict(data.get("values", {}))
+
+    def save(self, fingerprint, owners, values):
+        serializable = {}
+        for key, value in values.items():
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            serializable[key] = value
+
+        data = {
+            "fingerprint": fingerprint,
+            "owners": dict(owners),
+            "values": serializable,
+        }
+        if data == self._data:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            # Replace the file whole, so that readers never see part of it
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, delete=False, suffix=".tmp"
+            ) as warm_file:
+                json.dump(data, warm_file)
+            os.replace(warm_file.name, self.path)
+            self._data = data
+        except OSError:
+            logger.warning(f"Could not write warm start file {self.path}")
+            try:
+                os.unlink(warm_file.name)
+            except (NameError, OSError):
+                pass
@@ -64,6 +64,7 @@ setup(
         "credstash": ["credstash>=1.0.0,<2"],
         "django": ["Django>=2.2,<4"],
         "test": test_requires,
+        "benchmark": test_requires + ["fakeredis"],
     },
     use_scm_version={
         # PyPi doesn't allow local versions
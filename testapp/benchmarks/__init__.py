@@ -0,0 +1,16 @@
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+_server = None
+
+
+def fake_redis_connection():
+    """Constance connection to an in-process fakeredis server."""
+    global _server
+    if fakeredis is None:
+        raise ImportError("The benchmarks require fakeredis to be installed.")
+    if _server is None:
+        _server = fakeredis.FakeServer()
+    return fakeredis.FakeRedis(server=_server)
@@ -0,0 +1,21 @@
+from settings_constance import (  # noqa: F401
+    INSTALLED_APPS,
+    SECRET_KEY,
+    THE_SECRET_KEY,
+    THE_SECRET_VALUE,
+)
+
+# Keys available to every loader in the benchmarks
+BENCHMARK_KEYS = 200
+
+# Served by an in-process fakeredis, so the benchmarks run offline
+CONSTANCE_REDIS_CONNECTION_CLASS = "benchmarks.fake_redis_connection"
+CONSTANCE_REDIS_PREFIX = "benchmark"
+
+CONSTANCE_CONFIG = {
+    f"BENCH_KEY_{i}": (i, "Benchmark setting") for i in range(BENCHMARK_KEYS)
+}
+
+BENCH = {f"KEY_{i}": i for i in range(BENCHMARK_KEYS)}
+
+USE_TZ = False
@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+
+from configular import Settings
+from configular.base_loader import AsyncBaseLoader
+from configular.base_secret_manager import AsyncBaseSecretManager
+from configular.credstash_manager import CredstashManager
+from configular.environ_loader import EnvironLoader
+
+
+class AsyncLoader(AsyncBaseLoader):
+    def has_key(self):
+        return self.key == "FISH"
+
+    async def aget_value(self):
+        await asyncio.sleep(0)
+        return "%%fish%%"
+
+
+class AsyncManager(AsyncBaseSecretManager):
+    def __init__(self, secrets, **kwargs):
+        super().__init__(**kwargs)
+        self.secrets = secrets
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ado_get_secret(self, key):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.secrets[key]
+
+
+def test_aget_sync_loader_and_manager(credstash, monkeypatch):
+    credstash.putSecret("fish", "goodbye")
+    monkeypatch.setenv("TEST_PREFIX_FISH", "%%fish%%")
+    loader_settings = Settings(
+        {"FISH": "thanks"},
+        "TEST_PREFIX",
+        loaders=[EnvironLoader],
+        secrets_managers=[CredstashManager()],
+    )
+
+    assert asyncio.run(loader_settings.aget("FISH")) == "goodbye"
+
+
+def test_aget_raises_for_missing():
+    loader_settings = Settings({"A_SETTING": "DEFAULT"}, "TEST_PREFIX")
+
+    with pytest.raises(AttributeError):
+        asyncio.run(loader_settings.aget("FOO"))
+
+
+def test_aload_all_resolves_concurrently():
+    manager = AsyncManager({"fish": "goodbye", "chips": "hello"})
+    loader_settings = Settings(
+        {"FISH": "%%fish%%", "CHIPS": "%%chips%%", "PLAIN": 42},
+        "TEST_PREFIX",
+        secrets_managers=[manager],
+    )
+
+    values = asyncio.run(loader_settings.aload_all())
+
+    assert values == {"FISH": "goodbye", "CHIPS": "hello", "PLAIN": 42}
+    assert manager.max_in_flight == 2
+
+
+def test_async_loader():
+    manager = AsyncManager({"fish": "goodbye"})
+    loader_settings = Settings(
+        {"FISH": "thanks", "CHIPS": "hello"},
+        "TEST_PREFIX",
+        loaders=[AsyncLoader],
+        secrets_managers=[manager],
+    )
+
+    assert asyncio.run(loader_settings.aget("FISH")) == "goodbye"
+    assert asyncio.run(loader_settings.aget("CHIPS")) == "hello"
+    # Async loaders and managers can still be read synchronously
+    assert loader_settings.FISH == "goodbye"
+
+
+def test_async_loader_sync_read_inside_loop():
+    loader_settings = Settings({"FISH": "thanks"}, "TEST_PREFIX", loaders=[AsyncLoader])
+
+    async def read():
+        return loader_settings.FISH
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(read())
+
+
+def test_async_manager_errors(mocker):
+    manager = AsyncManager({}, fail_on_error=False)
+    loader_settings = Settings(
+        {"FISH": "%%fish%%"}, "TEST_PREFIX", secrets_managers=[manager]
+    )
+    mock_logger = mocker.patch("configular.base_secret_manager.logger")
+
+    assert asyncio.run(loader_settings.aget("FISH")) == "%%fish%%"
+    mock_logger.exception.assert_called_once()
@@ -0,0 +1,203 @@
+import threading
+
+import pytest
+
+from configular import Settings
+from configular.cache import CachedLookup, SecretCache
+from configular.environ_loader import EnvironLoader
+
+
+class LiveEnvironLoader(EnvironLoader):
+    live = True
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = mocker.patch("configular.cache.time.monotonic", return_value=100.0)
+    yield clock
+
+
+@pytest.fixture
+def counter():
+    calls = []
+
+    def lookup():
+        calls.append(None)
+        return len(calls)
+
+    lookup.calls = calls
+    yield lookup
+
+
+class TestCachedLookup:
+    def test_serves_cached_value(self, clock, counter):
+        lookup = CachedLookup(counter, ttl=10)
+
+        assert lookup() == 1
+        clock.return_value = 105.0
+        assert lookup() == 1
+        assert len(counter.calls) == 1
+
+    def test_expired_value_is_reloaded(self, clock, counter):
+        lookup = CachedLookup(counter, ttl=10)
+
+        assert lookup() == 1
+        clock.return_value = 110.0
+        assert lookup() == 2
+
+    def test_refresh_ahead(self, clock, counter):
+        lookup = CachedLookup(counter, ttl=10, refresh_ahead=0.5)
+        assert lookup() == 1
+
+        # WHEN read past the refresh point
+        clock.return_value = 106.0
+        # THEN the cached value is returned while refreshing in the background
+        assert lookup() == 1
+        lookup._refresh_thread.join()
+        assert lookup() == 2
+
+    def test_failed_refresh_keeps_value(self, clock, mocker):
+        mock_logger = mocker.patch("configular.cache.logger")
+        values = iter([1])
+        lookup = CachedLookup(lambda: next(values), ttl=10, refresh_ahead=0.5)
+        assert lookup() == 1
+
+        clock.return_value = 106.0
+        assert lookup() == 1
+        lookup._refresh_thread.join()
+
+        mock_logger.exception.assert_called_once()
+        clock.return_value = 109.0
+        assert lookup() == 1
+        lookup._refresh_thread.join()
+
+
+class TestSecretCache:
+    def test_caches_forever_by_default(self, clock, mocker):
+        fetch = mocker.Mock(return_value="secret")
+        cache = SecretCache()
+
+        assert cache.get("key", fetch) == "secret"
+        clock.return_value = 1e9
+        assert cache.get("key", fetch) == "secret"
+        fetch.assert_called_once_with("key")
+        assert cache.info() == (1, 1, 1024, 1)
+
+    def test_ttl(self, clock, mocker):
+        fetch = mocker.Mock(side_effect=["old", "new"])
+        cache = SecretCache(ttl=10)
+
+        assert cache.get("key", fetch) == "old"
+        clock.return_value = 110.0
+        assert cache.get("key", fetch) == "new"
+
+    def test_negative_ttl(self, clock, mocker):
+        fetch = mocker.Mock(side_effect=[None, "found"])
+        cache = SecretCache(negative_ttl=5)
+
+        assert cache.get("key", fetch) is None
+        assert cache.get("key", fetch) is None
+        clock.return_value = 105.0
+        assert cache.get("key", fetch) == "found"
+        assert fetch.call_count == 2
+
+    def test_maxsize(self, mocker):
+        fetch = mocker.Mock(side_effect=lambda key: key.upper())
+        cache = SecretCache(maxsize=2)
+
+        cache.get("a", fetch)
+        cache.get("b", fetch)
+        cache.get("a", fetch)
+        # b is the least recently used
+        cache.get("c", fetch)
+        cache.get("a", fetch)
+        cache.get("b", fetch)
+
+        assert [c.args[0] for c in fetch.call_args_list] == ["a", "b", "c", "b"]
+
+    def test_invalidate(self, mocker):
+        fetch = mocker.Mock(side_effect=["old", "new"])
+        on_change = mocker.Mock()
+        cache = SecretCache(on_change=on_change)
+        cache.get("key", fetch)
+
+        cache.invalidate("key")
+
+        assert cache.get("key", fetch) == "new"
+        on_change.assert_not_called()
+
+    def test_stale_while_revalidate(self, clock, mocker):
+        fetched = threading.Event()
+        on_change = mocker.Mock(side_effect=lambda key: fetched.set())
+        fetch = mocker.Mock(side_effect=["old", "new"])
+        cache = SecretCache(ttl=10, stale_ttl=30, on_change=on_change)
+        assert cache.get("key", fetch) == "old"
+
+        # WHEN read after the ttl, but within the stale window
+        clock.return_value = 120.0
+        # THEN the stale value is returned while refreshing in the background
+        assert cache.get("key", fetch) == "old"
+        assert fetched.wait(5)
+
+        assert cache.get("key", fetch) == "new"
+        on_change.assert_called_once_with("key")
+        assert fetch.call_count == 2
+
+    def test_concurrent_misses_share_one_fetch(self, mocker):
+        release = threading.Event()
+
+        def fetch(key):
+            release.wait(5)
+            return "secret"
+
+        fetch = mocker.Mock(side_effect=fetch)
+        cache = SecretCache()
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get("key", fetch)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["secret"] * 5
+        fetch.assert_called_once_with("key")
+
+
+def test_settings_cache_ttl(clock, monkeypatch):
+    monkeypatch.setenv("TEST_PREFIX_A_SETTING", "first")
+    loader_settings = Settings(
+        {"A_SETTING": "DEFAULT", "OTHER": "DEFAULT"},
+        "TEST_PREFIX",
+        loaders=[LiveEnvironLoader],
+        cache_ttl=10,
+    )
+    assert loader_settings.A_SETTING == "first"
+
+    monkeypatch.setenv("TEST_PREFIX_A_SETTING", "second")
+    assert loader_settings.A_SETTING == "first"
+
+    clock.return_value = 110.0
+    assert loader_settings.A_SETTING == "second"
+
+
+def test_settings_cache_ttl_per_key(monkeypatch):
+    monkeypatch.setenv("TEST_PREFIX_A_SETTING", "first")
+    monkeypatch.setenv("TEST_PREFIX_OTHER", "first")
+    loader_settings = Settings(
+        {"A_SETTING": "DEFAULT", "OTHER": "DEFAULT"},
+        "TEST_PREFIX",
+        loaders=[LiveEnvironLoader],
+        cache_ttl={"A_SETTING": 10},
+    )
+    assert loader_settings.A_SETTING == "first"
+    assert loader_settings.OTHER == "first"
+
+    monkeypatch.setenv("TEST_PREFIX_A_SETTING", "second")
+    monkeypatch.setenv("TEST_PREFIX_OTHER", "second")
+
+    assert loader_settings.A_SETTING == "first"
+    assert loader_settings.OTHER == "second"
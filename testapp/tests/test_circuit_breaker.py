@@ -0,0 +1,175 @@
+import pytest
+
+from configular.base_secret_manager import BaseSecretManager
+from configular.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+from configular.credstash_manager import CredstashManager
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = mocker.patch(
+        "configular.circuit_breaker.time.monotonic", return_value=100.0
+    )
+    yield clock
+
+
+class FlakyManager(BaseSecretManager):
+    def __init__(self, secrets, **kwargs):
+        super().__init__(**kwargs)
+        self.secrets = secrets
+        self.down = False
+        self.calls = 0
+
+    def do_get_secret(self, key):
+        self.calls += 1
+        if self.down:
+            raise ConnectionError("backend down")
+        return self.secrets.get(key)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold(self, clock):
+        breaker = CircuitBreaker(failure_threshold=3)
+
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow()
+
+    def test_success_resets_failures(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CLOSED
+
+    def test_half_open_probe_and_backoff(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=1.0)
+        breaker.record_failure()
+
+        clock.return_value = 101.0
+        assert breaker.allow()
+        assert breaker.state == HALF_OPEN
+        # Only one probe at a time
+        assert not breaker.allow()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        clock.return_value = 102.5
+        # Backed off to 2 seconds
+        assert not breaker.allow()
+        clock.return_value = 103.0
+        assert breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow()
+
+    def test_backoff_is_capped(self, clock):
+        breaker = CircuitBreaker(
+            failure_threshold=1, reset_timeout=1.0, max_reset_timeout=3.0
+        )
+        breaker.record_failure()
+        for _ in range(5):
+            clock.return_value += 10
+            assert breaker.allow()
+            breaker.record_failure()
+
+        assert breaker._timeout == 3.0
+
+    def test_never_opens_without_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=None)
+
+        for _ in range(100):
+            breaker.record_failure()
+
+        assert breaker.allow()
+
+
+def test_manager_serves_last_known_good_while_open(clock, mocker):
+    manager = FlakyManager(
+        {"fish": "goodbye"},
+        fail_on_error=False,
+        circuit_breaker=CircuitBreaker(failure_threshold=2),
+    )
+    mocker.patch("configular.base_secret_manager.logger")
+    assert manager.get_secret("fish") == "goodbye"
+
+    manager.down = True
+    assert manager.get_secret("fish") is None
+    assert manager.get_secret("fish") is None
+    calls = manager.calls
+
+    # Open, the backend isn't called
+    assert manager.get_secret("fish") == "goodbye"
+    assert manager.get_secrets(["fish"]) == {"fish": "goodbye"}
+    assert manager.calls == calls
+
+    # The probe succeeds once the backend is back
+    manager.down = False
+    clock.return_value = 102.0
+    assert manager.get_secret("fish") == "goodbye"
+    assert manager.circuit_breaker.state == CLOSED
+
+
+def test_manager_fails_fast_without_known_value(clock, mocker):
+    manager = FlakyManager(
+        {}, ignore_errors=True, circuit_breaker=CircuitBreaker(failure_threshold=1)
+    )
+    manager.down = True
+
+    with pytest.raises(ConnectionError):
+        manager.get_secret("fish")
+    with pytest.raises(CircuitOpenError):
+        manager.get_secret("fish")
+    assert manager.calls == 1
+
+
+def test_cached_answers_served_while_open(credstash, clock, mocker):
+    manager = CredstashManager(circuit_breaker=CircuitBreaker(failure_threshold=2))
+    mocker.patch("configular.base_secret_manager.logger")
+    credstash.putSecret("fish", "goodbye")
+    assert manager.get_secret("missing") is None
+    assert manager.get_secret("fish") == "goodbye"
+
+    mocker.patch.object(credstash, "getSecret", side_effect=ConnectionError)
+    for key in ("a", "b"):
+        with pytest.raises(ConnectionError):
+            manager.get_secret(key)
+    assert manager.circuit_breaker.state == OPEN
+
+    # Cached misses are answers too, a later manager can serve the key
+    assert manager.get_secret("missing") is None
+    assert manager.get_secret("fish") == "goodbye"
+    with pytest.raises(CircuitOpenError):
+        manager.get_secret("chips")
+
+
+def test_last_good_bounded_and_cleared(clock, mocker):
+    manager = FlakyManager(
+        {"fish": "goodbye", "chips": "hello"},
+        fail_on_error=False,
+        circuit_breaker=CircuitBreaker(failure_threshold=1),
+    )
+    manager._last_good.maxsize = 1
+    mocker.patch("configular.base_secret_manager.logger")
+    manager.get_secret("fish")
+    manager.get_secret("chips")
+    assert manager._last_good.info().currsize == 1
+
+    manager.invalidate_secret("chips")
+    manager.down = True
+    manager.get_secret("chips")
+    # A revoked secret isn't served again
+    assert manager.get_secret("chips") is None
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+
+from configular import Settings
+from configular.base_loader import BaseLoader
+from configular.coercion import to_bool, to_duration, to_list
+from configular.credstash_manager import CredstashManager
+from configular.environ_loader import EnvironLoader
+from configular.exceptions import ImproperlyConfigured
+
+
+class LiveEnvironLoader(EnvironLoader):
+    live = True
+
+
+class LateLoader(BaseLoader):
+    values = {}
+
+    def has_key(self):
+        return self.key in self.values
+
+    def get_value(self):
+        return self.values[self.key]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("true", True), ("On", True), ("1", True), (1, True), ("no", False), ("", False)],
+)
+def test_to_bool(value, expected):
+    assert to_bool(value) is expected
+
+
+def test_to_list():
+    assert to_list("a, b,,c") == ["a", "b", "c"]
+    assert to_list('["a", 1]') == ["a", 1]
+    assert to_list(("a",)) == ["a"]
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (90, timedelta(seconds=90)),
+        ("2.5", timedelta(seconds=2.5)),
+        ("1h30m", timedelta(hours=1, minutes=30)),
+        ("2d", timedelta(days=2)),
+        ("250ms", timedelta(milliseconds=250)),
+    ],
+)
+def test_to_duration(value, expected):
+    assert to_duration(value) == expected
+
+
+def test_to_duration_invalid():
+    with pytest.raises(ValueError):
+        to_duration("soon")
+
+
+def test_coerces_environ_values(monkeypatch):
+    monkeypatch.setenv("TEST_PREFIX_WORKERS", "4")
+    monkeypatch.setenv("TEST_PREFIX_DEBUG", "yes")
+    monkeypatch.setenv("TEST_PREFIX_HOSTS", "a.example.com,b.example.com")
+    monkeypatch.setenv("TEST_PREFIX_OPTIONS", '{"retries": 3}')
+    monkeypatch.setenv("TEST_PREFIX_TIMEOUT", "30s")
+
+    loader_settings = Settings(
+        {"WORKERS": 1, "DEBUG": False, "HOSTS": [], "OPTIONS": {}, "TIMEOUT": 10},
+        "TEST_PREFIX",
+        loaders=[EnvironLoader],
+        types={
+            "WORKERS": int,
+            "DEBUG": bool,
+            "HOSTS": list,
+            "OPTIONS": dict,
+            "TIMEOUT": timedelta,
+        },
+    )
+
+    assert loader_settings.WORKERS == 4
+    assert loader_settings.DEBUG is True
+    assert loader_settings.HOSTS == ["a.example.com", "b.example.com"]
+    assert loader_settings.OPTIONS == {"retries": 3}
+    assert loader_settings.TIMEOUT == timedelta(seconds=30)
+
+
+def test_defaults_are_coerced():
+    loader_settings = Settings(
+        {"TIMEOUT": 10}, "TEST_PREFIX", types={"TIMEOUT": timedelta}
+    )
+
+    assert loader_settings.defaults["TIMEOUT"] == timedelta(seconds=10)
+    assert loader_settings.TIMEOUT == timedelta(seconds=10)
+
+
+def test_invalid_default_raises_at_init():
+    with pytest.raises(ImproperlyConfigured):
+        Settings({"WORKERS": "many"}, "TEST_PREFIX", types={"WORKERS": int})
+
+
+def test_type_without_default():
+    with pytest.raises(ImproperlyConfigured):
+        Settings({}, "TEST_PREFIX", types={"WORKERS": int})
+
+
+def test_invalid_value_raises_at_setup(monkeypatch):
+    monkeypatch.setenv("TEST_PREFIX_WORKERS", "many")
+    loader_settings = Settings(
+        {"WORKERS": 1},
+        "TEST_PREFIX",
+        loaders=[LiveEnvironLoader],
+        types={"WORKERS": int},
+    )
+
+    with pytest.raises(ImproperlyConfigured):
+        loader_settings.warm()
+    with pytest.raises(ImproperlyConfigured):
+        loader_settings.WORKERS
+
+
+def test_loaders_not_consulted_at_init(monkeypatch):
+    loader_settings = Settings(
+        {"WORKERS": 4}, "TEST_PREFIX", loaders=[LateLoader], types={"WORKERS": int}
+    )
+
+    # As when the loader's source is only ready after import time
+    monkeypatch.setattr(LateLoader, "values", {"WORKERS": "8"})
+    assert loader_settings.WORKERS == 8
+
+
+@pytest.mark.parametrize(
+    "default, coercer, expected",
+    [
+        ('{"a": 1}', json.loads, {"a": 1}),
+        ("a,b", lambda value: value.split(","), ["a", "b"]),
+    ],
+)
+def test_defaults_coerced_once(default, coercer, expected):
+    loader_settings = Settings({"X": default}, "TEST_PREFIX", types={"X": coercer})
+
+    assert loader_settings.X == expected
+
+
+def test_placeholder_default_coerced_after_resolving(credstash):
+    credstash.putSecret("db_port", "5432")
+    loader_settings = Settings(
+        {"PORT": "%%db_port%%"},
+        "TEST_PREFIX",
+        secrets_managers=[CredstashManager()],
+        types={"PORT": int},
+    )
+
+    assert loader_settings.defaults["PORT"] == "%%db_port%%"
+    assert loader_settings.PORT == 5432
+
+
+def test_coerces_once_per_raw_value(monkeypatch, mocker):
+    coercer = mocker.Mock(side_effect=int)
+    monkeypatch.setenv("TEST_PREFIX_WORKERS", "4")
+    loader_settings = Settings(
+        {"WORKERS": 1},
+        "TEST_PREFIX",
+        loaders=[LiveEnvironLoader],
+        types={"WORKERS": coercer},
+    )
+
+    assert loader_settings.WORKERS == 4
+    assert loader_settings.WORKERS == 4
+    monkeypatch.setenv("TEST_PREFIX_WORKERS", "8")
+    assert loader_settings.WORKERS == 8
+    assert asyncio.run(loader_settings.aget("WORKERS")) == 8
+    # The default, "4" and "8"
+    assert coercer.call_count == 3
@@ -0,0 +1,229 @@
+import os
+import time
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+
+from configular import Settings
+from configular.constance_loader import ConstanceLoader, ConstancePubSub
+
+pytestmark = [
+    pytest.mark.skipif(
+        os.environ.get("DJANGO_SETTINGS_MODULE") != "settings_constance",
+        reason="requires constance to be installed when calling django.setup()",
+    ),
+    pytest.mark.usefixtures("no_credstash"),
+]
+
+
+@pytest.fixture(autouse=True)
+def fresh_prefetch(mocker):
+    mocker.patch.object(ConstanceLoader, "_prefetched", {})
+
+
+class CachedConstanceLoader(ConstanceLoader):
+    max_age = 60
+
+
+def test_setup_is_one_round_trip(redisdb, settings, mocker):
+    from constance import config
+
+    mget = mocker.spy(config._backend, "mget")
+    get = mocker.spy(config._backend, "get")
+    loader_settings = Settings(
+        {"THE_ANSWER": 21, "THE_SECRET": "Not a secret", "FISH": "thanks"},
+        "TEST_PREFIX",
+        loaders=[ConstanceLoader],
+    )
+
+    assert loader_settings.FISH == "thanks"
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+
+    mget.assert_called_once()
+    # Only the read of THE_ANSWER goes to the backend
+    assert {c.args[0] for c in get.call_args_list} == {"TEST_PREFIX_THE_ANSWER"}
+
+
+def test_prefetch_values(redisdb, settings):
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+
+    values = ConstanceLoader.prefetch("TEST_PREFIX")
+
+    assert values == {
+        "TEST_PREFIX_THE_ANSWER": 0,
+        "TEST_PREFIX_THE_SECRET": f"%%{settings.THE_SECRET_KEY}%%",
+    }
+
+
+def test_max_age_serves_prefetched_values(redisdb, settings, mocker):
+    from constance import config
+
+    loader_settings = Settings(
+        {"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[CachedConstanceLoader]
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+
+    # As if saved by another process
+    with mock.patch("constance.signals.config_updated.send"):
+        call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+    get = mocker.spy(config._backend, "get")
+
+    # Still within max_age
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    get.assert_not_called()
+
+    CachedConstanceLoader.refresh("TEST_PREFIX")
+    assert loader_settings.THE_ANSWER == 0
+
+
+def test_max_age_expiry_refreshes_in_one_batch(redisdb, settings, mocker):
+    from constance import config
+
+    loader_settings = Settings(
+        {"THE_ANSWER": 21, "THE_SECRET": "Not a secret"},
+        "TEST_PREFIX",
+        loaders=[CachedConstanceLoader],
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+    mocker.patch.object(CachedConstanceLoader, "max_age", -1)
+    mget = mocker.spy(config._backend, "mget")
+
+    assert loader_settings.THE_ANSWER == 0
+    mget.assert_called_once()
+
+
+def test_config_updated_applies_saved_value(redisdb, settings, mocker):
+    from constance import config
+
+    loader_settings = Settings(
+        {"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[CachedConstanceLoader]
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+    get = mocker.spy(config._backend, "get")
+
+    assert loader_settings.THE_ANSWER == 0
+    get.assert_not_called()
+
+
+def test_config_updated_invalidates_cached_setting(redisdb, settings, mocker):
+    loader_settings = Settings(
+        {"THE_ANSWER": 21, "FISH": "thanks"},
+        "TEST_PREFIX",
+        loaders=[ConstanceLoader],
+        cache_ttl=3600,
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    assert loader_settings.FISH == "thanks"
+    invalidate = mocker.spy(loader_settings, "invalidate")
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+
+    assert loader_settings.THE_ANSWER == 0
+    invalidate.assert_called_once_with("THE_ANSWER")
+
+
+def test_config_updated_invalidates_without_prefetch(redisdb, settings, mocker):
+    loader_settings = Settings(
+        {"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[ConstanceLoader], cache_ttl=600
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    # As when the key was read without prefetching the prefix
+    ConstanceLoader._prefetched.clear()
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+
+    assert loader_settings.THE_ANSWER == 0
+
+
+def test_bulk_values_from_prefetch(redisdb, settings, mocker):
+    from constance import config
+
+    ConstanceLoader.prefetch("TEST_PREFIX")
+    get = mocker.spy(config._backend, "get")
+
+    assert ConstanceLoader.bulk_values("TEST_PREFIX", ["THE_ANSWER", "FISH"]) == {
+        "THE_ANSWER": settings.THE_ANSWER
+    }
+    get.assert_not_called()
+
+
+class UntilSavedConstanceLoader(ConstanceLoader):
+    max_age = None
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def pubsub(redis_conn):
+    pubsub = ConstancePubSub(redis_conn, channel="configular:test")
+    pubsub.start()
+    # Wait until subscribed, so no message is missed
+    wait_for(lambda: redis_conn.pubsub_numsub("configular:test")[0][1])
+    yield pubsub
+    pubsub.stop()
+
+
+def test_max_age_none_serves_until_saved(redisdb, settings, mocker):
+    from constance import config
+
+    loader_settings = Settings(
+        {"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[UntilSavedConstanceLoader]
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    with mock.patch.object(config._backend, "get") as get:
+        assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    get.assert_not_called()
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+    get = mocker.spy(config._backend, "get")
+
+    assert loader_settings.THE_ANSWER == 0
+    get.assert_not_called()
+
+
+def test_pubsub_applies_saves_from_other_processes(redisdb, settings, pubsub):
+    loader_settings = Settings(
+        {"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[UntilSavedConstanceLoader]
+    )
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+
+    # As if saved by another process
+    with mock.patch("constance.signals.config_updated.send"):
+        call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+    assert loader_settings.THE_ANSWER == settings.THE_ANSWER
+    pubsub.publish("TEST_PREFIX_THE_ANSWER")
+
+    wait_for(lambda: loader_settings.THE_ANSWER == 0)
+
+
+def test_pubsub_publishes_saves(redisdb, redis_conn, pubsub):
+    subscriber = redis_conn.pubsub(ignore_subscribe_messages=True)
+    subscriber.subscribe("configular:test")
+
+    call_command("constance", "set", "TEST_PREFIX_THE_ANSWER", 0)
+
+    message = None
+    deadline = time.monotonic() + 5
+    while message is None and time.monotonic() < deadline:
+        message = subscriber.get_message(timeout=0.1)
+    subscriber.close()
+    assert message["data"] == b"TEST_PREFIX_THE_ANSWER"
+
+
+def test_pubsub_stop(redisdb, pubsub):
+    from configular import constance_loader
+
+    pubsub.stop()
+
+    assert constance_loader._pubsub is None
+    assert pubsub._thread is None
@@ -0,0 +1,138 @@
+from configular import Settings
+from configular.credstash_manager import CredstashManager
+
+
+def test_rotated_secret_picked_up_after_ttl(credstash, mocker):
+    clock = mocker.patch("configular.cache.time.monotonic", return_value=100.0)
+    CM = CredstashManager(ttl=60)
+    credstash.putSecret("fish", "goodbye")
+    loader_settings = Settings(
+        {"FISH": "%%fish%%"}, "TEST_PREFIX", secrets_managers=[CM]
+    )
+    assert loader_settings.FISH == "goodbye"
+
+    credstash.putSecret("fish", "so long")
+    assert loader_settings.FISH == "goodbye"
+
+    clock.return_value = 160.0
+    assert loader_settings.FISH == "so long"
+
+
+def test_invalidate_secret(credstash):
+    CM = CredstashManager()
+    credstash.putSecret("fish", "goodbye")
+    credstash.putSecret("chips", "hello")
+    loader_settings = Settings(
+        {"FISH": "%%fish%%", "CHIPS": "%%chips%%"},
+        "TEST_PREFIX",
+        secrets_managers=[CM],
+    )
+    assert loader_settings.FISH == "goodbye"
+    assert loader_settings.CHIPS == "hello"
+
+    credstash.putSecret("fish", "so long")
+    credstash.putSecret("chips", "hi")
+    CM.invalidate_secret("fish")
+
+    assert loader_settings.FISH == "so long"
+    assert loader_settings.CHIPS == "hello"
+
+
+def test_missing_secret_is_retried(credstash, mocker):
+    clock = mocker.patch("configular.cache.time.monotonic", return_value=100.0)
+    CM = CredstashManager(negative_ttl=10)
+    loader_settings = Settings(
+        {"FISH": "%%fish%%"}, "TEST_PREFIX", secrets_managers=[CM]
+    )
+    assert loader_settings.FISH == "%%fish%%"
+
+    credstash.putSecret("fish", "goodbye")
+    assert loader_settings.FISH == "%%fish%%"
+
+    clock.return_value = 110.0
+    assert loader_settings.FISH == "goodbye"
+
+
+def test_prefetch_secrets(credstash, mocker):
+    CM = CredstashManager()
+    credstash.putSecret("fish", "goodbye")
+    credstash.putSecret("chips", "hello")
+    loader_settings = Settings(
+        {
+            "FISH": "%%fish%%",
+            "FISH_AGAIN": "%%fish%%",
+            "CHIPS": "%%chips%%",
+            "PEAS": "%%peas%%",
+            "PLAIN": 42,
+        },
+        "TEST_PREFIX",
+        secrets_managers=[CM],
+    )
+    get_secret = mocker.spy(credstash, "getSecret")
+
+    report = loader_settings.prefetch_secrets(max_workers=2)
+
+    assert set(report) == {"fish", "chips", "peas"}
+    assert report["fish"].found and report["chips"].found
+    assert not report["peas"].found
+    assert report["peas"].error is None
+    assert all(result.seconds >= 0 for result in report.values())
+    assert get_secret.call_count == 3
+
+    # The secrets are already cached
+    assert loader_settings.FISH == "goodbye"
+    assert loader_settings.FISH_AGAIN == "goodbye"
+    assert loader_settings.CHIPS == "hello"
+    assert get_secret.call_count == 3
+
+
+def test_prefetch_secrets_reports_errors(credstash, mocker):
+    CM = CredstashManager(ignore_errors=True)
+    mocker.patch.object(credstash, "getSecret", side_effect=ValueError("KMS down"))
+    loader_settings = Settings(
+        {"FISH": "%%fish%%"}, "TEST_PREFIX", secrets_managers=[CM]
+    )
+
+    report = loader_settings.prefetch_secrets()
+
+    assert isinstance(report["fish"].error, ValueError)
+    assert not report["fish"].found
+
+
+def test_prefetch_secrets_without_managers():
+    loader_settings = Settings({"FISH": "%%fish%%"}, "TEST_PREFIX")
+
+    assert loader_settings.prefetch_secrets() == {}
+
+
+def test_get_secrets(credstash):
+    CM = CredstashManager()
+    credstash.putSecret("fish", "goodbye")
+    credstash.putSecret("chips", "hello")
+
+    assert CM.get_secrets(["fish", "chips", "peas"]) == {
+        "fish": "goodbye",
+        "chips": "hello",
+        "peas": None,
+    }
+    assert CM.cache_info().currsize == 3
+
+
+def test_get_secrets_serves_cached_keys_without_the_pool(credstash, mocker):
+    CM = CredstashManager()
+    credstash.putSecret("fish", "goodbye")
+    credstash.putSecret("chips", "hello")
+    assert CM.get_secrets(["fish", "chips"]) == {"fish": "goodbye", "chips": "hello"}
+    pool = CM._pool
+    executor = mocker.spy(CM, "_executor")
+
+    assert CM.get_secrets(["chips", "fish", "peas"]) == {
+        "chips": "hello",
+        "fish": "goodbye",
+        "peas": None,
+    }
+    executor.assert_not_called()
+
+    credstash.putSecret("salt", "shaker")
+    assert CM.get_secrets(["salt", "vinegar"]) == {"salt": "shaker", "vinegar": None}
+    assert CM._pool is pool
@@ -1,6 +1,7 @@
 import pytest
 
 from configular import Settings, decorators, exceptions
+from configular.django_loader import DjangoLoader
 
 
 class TestValidateSettingDecorator:
@@ -31,3 +32,54 @@ class TestValidateSettingDecorator:
         decorators.validate_setting(
             config=self.get_settings(), key="THE_ANSWER", validate_func=lambda x: True
         )
+
+    def test_validated_again_only_when_value_changes(self, settings, mocker):
+        settings.TEST_PREFIX = {"THE_ANSWER": 42}
+        validate_func = mocker.Mock(side_effect=lambda x: x == 42)
+
+        @decorators.validate_setting(
+            config=Settings({"THE_ANSWER": 21}, "TEST_PREFIX", loaders=[DjangoLoader]),
+            key="THE_ANSWER",
+            validate_func=validate_func,
+        )
+        def func():
+            return "Hi"
+
+        assert func() == "Hi"
+        assert func() == "Hi"
+        validate_func.assert_called_once_with(42)
+
+        settings.TEST_PREFIX = {"THE_ANSWER": 43}
+        with pytest.raises(exceptions.ImproperlyConfigured):
+            func()
+        with pytest.raises(exceptions.ImproperlyConfigured):
+            func()
+        assert validate_func.call_count == 2
+
+
+class TestValidateAll:
+    def test_passes(self, settings):
+        loader_settings = Settings({"THE_ANSWER": 42, "FISH": "thanks"}, "TEST_PREFIX")
+
+        loader_settings.validate_all(
+            {"THE_ANSWER": lambda x: x == 42, "FISH": lambda x: x == "thanks"}
+        )
+
+    def test_collects_every_failure(self, settings):
+        loader_settings = Settings({"THE_ANSWER": 21, "FISH": "thanks"}, "TEST_PREFIX")
+
+        with pytest.raises(exceptions.ImproperlyConfigured) as excinfo:
+            loader_settings.validate_all(
+                {
+                    "THE_ANSWER": lambda x: x == 42,
+                    "FISH": lambda x: x == "thanks",
+                    "CHIPS": lambda x: True,
+                    "COLOUR": lambda x: False,
+                }
+            )
+
+        message = str(excinfo.value)
+        assert "THE_ANSWER=21 not supported." in message
+        assert "FISH" not in message
+        assert "CHIPS" in message
+        assert "COLOUR" in message
@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+
+from configular import Settings
+from configular.exceptions import ImproperlyConfigured
+from configular.file_loader import FileLoader, parse_env
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = mocker.patch("configular.file_loader.time.monotonic", return_value=100.0)
+    yield clock
+
+
+def file_loader(*paths, check_interval=5):
+    return type(
+        "TestFileLoader",
+        (FileLoader,),
+        {"paths": [str(path) for path in paths], "check_interval": check_interval},
+    )
+
+
+def write_json(path, data, mtime=None):
+    path.write_text(json.dumps(data))
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_formats_and_override_order(tmp_path):
+    write_json(tmp_path / "base.json", {"TEST_PREFIX": {"A": 1, "B": 1, "C": 1}})
+    (tmp_path / "override.toml").write_text("[TEST_PREFIX]\nB = 2\nC = 2\n")
+    (tmp_path / "local.yaml").write_text("TEST_PREFIX:\n  C: 3\n")
+    (tmp_path / "missing.json").unlink(missing_ok=True)
+
+    Loader = file_loader(
+        tmp_path / "base.json",
+        tmp_path / "override.toml",
+        tmp_path / "local.yaml",
+        tmp_path / "missing.json",
+    )
+    loader_settings = Settings(
+        {"A": 0, "B": 0, "C": 0, "D": 0}, "TEST_PREFIX", loaders=[Loader]
+    )
+
+    assert loader_settings.A == 1
+    assert loader_settings.B == 2
+    assert loader_settings.C == 3
+    assert loader_settings.D == 0
+
+
+def test_parse_env():
+    lines = [
+        "# comment",
+        "TEST_PREFIX_A=one",
+        "export TEST_PREFIX_B = 'two'",
+        'TEST_PREFIX_C="three=3"',
+        "OTHER_D=four",
+    ]
+
+    assert parse_env(lines, "TEST_PREFIX") == {"A": "one", "B": "two", "C": "three=3"}
+
+
+def test_reparses_on_change_after_check_interval(tmp_path, clock, mocker):
+    path = tmp_path / "settings.json"
+    write_json(path, {"TEST_PREFIX": {"A": "first"}}, mtime=1_000_000_000)
+    Loader = file_loader(path)
+    loader_settings = Settings({"A": None, "B": None}, "TEST_PREFIX", loaders=[Loader])
+    load = mocker.spy(Loader, "load")
+
+    assert loader_settings.A == "first"
+    write_json(path, {"TEST_PREFIX": {"A": "second", "B": "new"}}, 2_000_000_000)
+    assert loader_settings.A == "first"
+
+    clock.return_value = 106.0
+    assert loader_settings.A == "second"
+    # Keys added to the file are picked up too
+    assert loader_settings.B == "new"
+    assert load.call_count == 2
+
+
+def test_unchanged_files_are_not_parsed_again(tmp_path, clock, mocker):
+    path = tmp_path / "settings.json"
+    write_json(path, {"TEST_PREFIX": {"A": "value"}})
+    Loader = file_loader(path)
+    loader_settings = Settings({"A": None}, "TEST_PREFIX", loaders=[Loader])
+    load = mocker.spy(Loader, "load")
+
+    assert loader_settings.A == "value"
+    clock.return_value = 200.0
+    assert loader_settings.A == "value"
+    assert load.call_count == 1
+
+
+def test_missing_parser(tmp_path, mocker):
+    mocker.patch("configular.file_loader.yaml", None)
+    path = tmp_path / "settings.yml"
+    path.write_text("TEST_PREFIX:\n  A: 1\n")
+
+    loader_settings = Settings({"A": None}, "TEST_PREFIX", loaders=[file_loader(path)])
+
+    with pytest.raises(ImproperlyConfigured):
+        loader_settings.A
+
+
+def test_dotenv_file(tmp_path):
+    (tmp_path / ".env").write_text("TEST_PREFIX_A=from env file\n")
+
+    loader_settings = Settings(
+        {"A": None}, "TEST_PREFIX", loaders=[file_loader(tmp_path / ".env")]
+    )
+
+    assert loader_settings.A == "from env file"
+
+
+def test_broken_file_keeps_last_values(tmp_path, clock, mocker):
+    path = tmp_path / "settings.json"
+    write_json(path, {"TEST_PREFIX": {"A": "first"}}, mtime=1_000_000_000)
+    Loader = file_loader(path)
+    loader_settings = Settings({"A": None}, "TEST_PREFIX", loaders=[Loader])
+    mock_logger = mocker.patch("configular.file_loader.logger")
+    load = mocker.spy(Loader, "load")
+
+    assert loader_settings.A == "first"
+    path.write_text('{"TEST_PREFIX": {"A": "sec')
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    clock.return_value = 106.0
+    assert loader_settings.A == "first"
+    mock_logger.exception.assert_called_once()
+
+    # Not parsed again until the file changes
+    clock.return_value = 112.0
+    assert loader_settings.A == "first"
+    assert load.call_count == 2
+
+    write_json(path, {"TEST_PREFIX": {"A": "second"}}, 3_000_000_000)
+    clock.return_value = 118.0
+    assert loader_settings.A == "second"
@@ -0,0 +1,84 @@
+import os
+import threading
+
+import pytest
+
+import configular
+from configular import Settings, cache
+from configular.cache import CachedLookup
+from configular.credstash_manager import CredstashManager
+
+
+def test_warm_resolves_settings_and_secrets(credstash, settings, mocker):
+    loader_settings = Settings(
+        {"THE_SECRET": f"%%{settings.THE_SECRET_KEY}%%", "FISH": "thanks"},
+        "TEST_PREFIX",
+        secrets_managers=[CredstashManager()],
+    )
+
+    report = loader_settings.warm()
+
+    assert report[settings.THE_SECRET_KEY].found
+    assert loader_settings._init
+    get_secret = mocker.spy(credstash, "getSecret")
+    assert loader_settings.THE_SECRET == settings.THE_SECRET_VALUE
+    get_secret.assert_not_called()
+
+
+def test_warm_all_settings(mocker):
+    loader_settings = Settings({"FISH": "thanks"}, "TEST_PREFIX")
+    warm = mocker.spy(loader_settings, "warm")
+
+    configular.warm()
+
+    warm.assert_called_once_with()
+
+
+def test_after_fork_resets_held_locks():
+    loader_settings = Settings({"FISH": "thanks"}, "TEST_PREFIX")
+    lookup = CachedLookup(lambda: "thanks", ttl=10)
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with loader_settings._lock, lookup._refreshing:
+            held.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    held.wait()
+
+    # As in a child forked while another thread held the locks
+    configular._after_fork()
+    cache._after_fork()
+
+    assert loader_settings._lock.acquire(blocking=False)
+    assert lookup._refreshing.acquire(blocking=False)
+    release.set()
+    thread.join()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_forked_child_inherits_warmed_settings(credstash, settings, mocker):
+    loader_settings = Settings(
+        {"THE_SECRET": f"%%{settings.THE_SECRET_KEY}%%"},
+        "TEST_PREFIX",
+        secrets_managers=[CredstashManager()],
+    )
+    loader_settings.warm()
+    # The child must not look the secret up again
+    mocker.patch.object(credstash, "getSecret", side_effect=AssertionError)
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            ok = loader_settings.THE_SECRET == settings.THE_SECRET_VALUE
+            with loader_settings._lock:
+                pass
+        finally:
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
@@ -0,0 +1,112 @@
+import asyncio
+
+from configular import Settings
+from configular.credstash_manager import CredstashManager
+from configular.environ_loader import EnvironLoader
+from configular.metrics import BUCKETS, Histogram, Metrics
+
+
+class LiveEnvironLoader(EnvironLoader):
+    live = True
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram()
+    histogram.observe(0.0002)
+    histogram.observe(0.02)
+    histogram.observe(10)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 3
+    assert snapshot["buckets"][0.0001] == 0
+    assert snapshot["buckets"][0.0005] == 1
+    assert snapshot["buckets"][0.05] == 2
+    assert snapshot["buckets"][BUCKETS[-1]] == 3
+
+
+def test_counts_accesses():
+    metrics = Metrics()
+    loader_settings = Settings({"A": 1, "B": 2}, "TEST_PREFIX", metrics=metrics)
+
+    loader_settings.A
+    loader_settings.A
+    loader_settings.B
+
+    stats = loader_settings.stats()
+    assert stats["accesses"] == {"TEST_PREFIX_A": 2, "TEST_PREFIX_B": 1}
+    # Static values aren't stored as attributes, so every read is counted
+    assert "A" not in loader_settings.__dict__
+    assert stats["latency"]["setup"]["TEST_PREFIX"]["count"] == 2
+
+
+def test_counts_async_accesses():
+    metrics = Metrics()
+    loader_settings = Settings({"A": 1}, "TEST_PREFIX", metrics=metrics)
+
+    assert asyncio.run(loader_settings.aget("A")) == 1
+    assert asyncio.run(loader_settings.aload_all()) == {"A": 1}
+
+    assert metrics.snapshot()["accesses"] == {"TEST_PREFIX_A": 2}
+
+
+def test_samples_call_sites():
+    metrics = Metrics(sample_call_sites=1.0)
+    loader_settings = Settings({"A": 1}, "TEST_PREFIX", metrics=metrics)
+
+    loader_settings.A
+
+    (call_site,) = metrics.snapshot()["call_sites"]["TEST_PREFIX_A"]
+    assert call_site.startswith(__file__)
+
+
+def test_times_loaders(monkeypatch):
+    monkeypatch.setenv("TEST_PREFIX_A", "environ")
+    metrics = Metrics()
+    loader_settings = Settings(
+        {"A": 1}, "TEST_PREFIX", loaders=[LiveEnvironLoader], metrics=metrics
+    )
+
+    assert loader_settings.A == "environ"
+    assert loader_settings.A == "environ"
+
+    latency = loader_settings.stats()["latency"]["loader"]["LiveEnvironLoader"]
+    assert latency["count"] == 2
+
+
+def test_times_secrets_managers_and_reports_caches(credstash):
+    credstash.putSecret("fish", "goodbye")
+    metrics = Metrics()
+    loader_settings = Settings(
+        {"A": "%%fish%%"},
+        "TEST_PREFIX",
+        secrets_managers=[CredstashManager()],
+        metrics=metrics,
+    )
+
+    assert loader_settings.A == "goodbye"
+
+    stats = loader_settings.stats()
+    assert stats["latency"]["secrets_manager"]["CredstashManager"]["count"] == 1
+    (cache,) = stats["secret_caches"]
+    assert cache["manager"] == "CredstashManager"
+    assert cache["misses"] == 1
+
+
+def test_callbacks():
+    measurements = []
+    metrics = Metrics(callbacks=[lambda *args: measurements.append(args)])
+    loader_settings = Settings({"A": 1}, "TEST_PREFIX", metrics=metrics)
+
+    loader_settings.A
+
+    assert ("configular.access", 1, {"key": "TEST_PREFIX_A"}) in measurements
+    assert any(name == "configular.setup.latency" for name, _, _ in measurements)
+
+
+def test_stats_without_metrics():
+    loader_settings = Settings({"A": 1}, "TEST_PREFIX")
+
+    loader_settings.A
+
+    assert loader_settings.stats() == {"secret_caches": []}
+    assert loader_settings.__dict__["A"] == 1
@@ -1,16 +1,36 @@
+import asyncio
+import json
 import os
+import re
+import threading
 
 import pytest
 from django.core.management import call_command
+from django.test import override_settings
 
-from configular import Settings
+from configular import SecretScanner, Settings
+from configular.base_loader import BaseLoader, LoaderNotReady
 from configular.constance_loader import ConstanceLoader
 from configular.credstash_manager import CredstashManager
 from configular.django_loader import DjangoLoader
 from configular.environ_loader import EnvironLoader
+from configular.exceptions import ImproperlyConfigured
 
 CM = CredstashManager()
 
+
+class DictLoader(BaseLoader):
+    """Dynamic loader, reading from `values` on every access."""
+
+    values = {}
+
+    def has_key(self):
+        return self.key in self.values
+
+    def get_value(self):
+        return self.values[self.key]
+
+
 settings_kwargs = {
     "loaders": [ConstanceLoader, DjangoLoader, EnvironLoader],
     "secrets_managers": [CM],
@@ -43,6 +63,7 @@ def test_django_settings(settings):
 
     assert loader_settings.A_SETTING == "NEW_VALUE"
     # Cover the _init flag short circut
+    loader_settings._setup(loader_settings.defaults, loader_settings.prefix)
     loader_settings._setup(None, None)
 
 
@@ -251,3 +272,493 @@ class TestWithCredstash:
         )
 
         assert loader_settings.FISH == "goodbye"
+
+    def test_resolved_value_memoized(self, credstash, monkeypatch, mocker):
+        CM.flush_secret_cache()
+        credstash.putSecret("fish", "goodbye")
+        credstash.putSecret("chips", "hello")
+        monkeypatch.setattr(DictLoader, "values", {"FISH": "%%fish%%"})
+        get_secret = mocker.spy(SecretScanner, "get_secret")
+        loader_settings = Settings(
+            {"FISH": "thanks"},
+            "TEST_PREFIX",
+            loaders=[DictLoader],
+            secrets_managers=[CM],
+        )
+
+        # Any number of accesses for the same raw value
+        assert loader_settings.FISH == "goodbye"
+        assert loader_settings.FISH == "goodbye"
+        # Only resolve the secret once
+        assert get_secret.call_count == 1
+
+        # WHEN the raw value changes
+        DictLoader.values["FISH"] = "%%chips%%"
+        # THEN it is resolved again
+        assert loader_settings.FISH == "hello"
+        assert loader_settings.FISH == "hello"
+        assert get_secret.call_count == 2
+
+        # WHEN a manager is flushed
+        CM.flush_secret_cache()
+        # THEN it is resolved again
+        assert loader_settings.FISH == "hello"
+        assert get_secret.call_count == 3
+
+    def test_memo_swapped_during_read(self, credstash):
+        credstash.putSecret("fish", "goodbye")
+        scanner = SecretScanner(lambda: "%%fish%%", [CM])
+        scanner()
+        generation = scanner._memo[1]
+
+        class SwappingMemo(tuple):
+            def __iter__(self):
+                # Another thread resolving a different raw value meanwhile
+                scanner._memo = ("%%chips%%", generation, "hello", None)
+                return super().__iter__()
+
+        scanner._memo = SwappingMemo(scanner._memo)
+
+        assert scanner() == "goodbye"
+
+
+class CountingLoader(EnvironLoader):
+    probes = []
+
+    def has_key(self):
+        self.probes.append(self.key)
+        return super().has_key()
+
+
+def test_lookups_resolved_on_first_access(monkeypatch):
+    CountingLoader.probes = []
+    monkeypatch.setenv("TEST_PREFIX_A_SETTING", "NEW_VALUE")
+    loader_settings = Settings(
+        {"A_SETTING": "DEFAULT", "ANOTHER_SETTING": "AMAZING"},
+        "TEST_PREFIX",
+        loaders=[CountingLoader],
+    )
+
+    assert loader_settings.A_SETTING == "NEW_VALUE"
+    assert loader_settings.A_SETTING == "NEW_VALUE"
+    assert CountingLoader.probes == ["A_SETTING"]
+
+    assert loader_settings.ANOTHER_SETTING == "AMAZING"
+    assert CountingLoader.probes == ["A_SETTING", "ANOTHER_SETTING"]
+
+
+def test_concurrent_first_access_resolves_once(monkeypatch):
+    CountingLoader.probes = []
+    loader_settings = Settings(
+        {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[CountingLoader]
+    )
+    barrier = threading.Barrier(8)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(loader_settings.A_SETTING)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["DEFAULT"] * 8
+    assert CountingLoader.probes == ["A_SETTING"]
+
+
+def test_static_values_stored_as_attributes(settings, monkeypatch):
+    settings.TEST_PREFIX = {"DJANGO": "django"}
+    monkeypatch.setattr(DictLoader, "values", {"DYNAMIC": "dynamic"})
+    loader_settings = Settings(
+        {"DEFAULT": "default", "DJANGO": "DEFAULT", "DYNAMIC": "DEFAULT"},
+        "TEST_PREFIX",
+        loaders=[DictLoader, DjangoLoader],
+    )
+    loader_settings._setup(loader_settings.defaults, loader_settings.prefix)
+
+    assert vars(loader_settings)["DEFAULT"] == "default"
+    assert vars(loader_settings)["DJANGO"] == "django"
+    assert "DYNAMIC" not in vars(loader_settings)
+
+    # WHEN invalidated
+    loader_settings.invalidate("DJANGO")
+    settings.TEST_PREFIX = {"DJANGO": "changed"}
+    # THEN the value is loaded again
+    assert "DJANGO" not in vars(loader_settings)
+    assert loader_settings.DJANGO == "changed"
+
+
+def test_setting_named_like_an_attribute():
+    loader_settings = Settings({"prefix": "default"}, "TEST_PREFIX")
+
+    loader_settings._setup(loader_settings.defaults, loader_settings.prefix)
+
+    assert loader_settings.prefix == "TEST_PREFIX"
+
+
+def test_looks_like_credstash_warns_once(monkeypatch, mocker):
+    monkeypatch.setattr(DictLoader, "values", {"FISH": "%%fish%%"})
+    loader_settings = Settings(
+        {"FISH": "thanks", "CHIPS": "%%chips%%"}, "TEST_PREFIX", loaders=[DictLoader]
+    )
+    mock_logger = mocker.patch("configular.logger")
+
+    assert loader_settings.FISH == "%%fish%%"
+    assert loader_settings.FISH == "%%fish%%"
+    assert loader_settings.CHIPS == "%%chips%%"
+    assert loader_settings.CHIPS == "%%chips%%"
+
+    assert mock_logger.warning.call_count == 2
+
+
+class TestEnvironSnapshot:
+    def test_snapshot(self, monkeypatch):
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "first")
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[EnvironLoader]
+        )
+        assert loader_settings.A_SETTING == "first"
+
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "second")
+        assert loader_settings.A_SETTING == "first"
+
+        EnvironLoader.rescan("TEST_PREFIX")
+        assert loader_settings.A_SETTING == "second"
+
+    def test_rescan_finds_new_keys(self, monkeypatch):
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[EnvironLoader]
+        )
+        assert loader_settings.A_SETTING == "DEFAULT"
+
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "NEW_VALUE")
+        EnvironLoader.rescan("TEST_PREFIX")
+
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+
+    def test_scanned_once_per_prefix(self, monkeypatch, mocker):
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "NEW_VALUE")
+        scan = mocker.spy(EnvironLoader, "scan")
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT", "ANOTHER_SETTING": "AMAZING"},
+            "TEST_PREFIX",
+            loaders=[EnvironLoader],
+        )
+
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+        assert loader_settings.ANOTHER_SETTING == "AMAZING"
+        scan.assert_called_once_with("TEST_PREFIX")
+
+    def test_live(self, monkeypatch):
+        class LiveEnvironLoader(EnvironLoader):
+            live = True
+
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "first")
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[LiveEnvironLoader]
+        )
+        assert loader_settings.A_SETTING == "first"
+
+        monkeypatch.setenv("TEST_PREFIX_A_SETTING", "second")
+        assert loader_settings.A_SETTING == "second"
+
+
+class TestDjangoSettingChanged:
+    def test_override_settings(self, settings):
+        settings.TEST_PREFIX = {"A_SETTING": "NEW_VALUE"}
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT", "ANOTHER_SETTING": "AMAZING"},
+            "TEST_PREFIX",
+            loaders=[DjangoLoader],
+        )
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+        assert loader_settings.ANOTHER_SETTING == "AMAZING"
+
+        with override_settings(TEST_PREFIX={"ANOTHER_SETTING": "OVERRIDDEN"}):
+            assert loader_settings.A_SETTING == "DEFAULT"
+            assert loader_settings.ANOTHER_SETTING == "OVERRIDDEN"
+
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+        assert loader_settings.ANOTHER_SETTING == "AMAZING"
+
+    def test_override_after_another_settings_object(self, settings):
+        settings.TEST_PREFIX = {"A_SETTING": "NEW_VALUE"}
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[DjangoLoader]
+        )
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+
+        # Resets the shared mapping for the prefix
+        Settings({"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[DjangoLoader])
+
+        with override_settings(TEST_PREFIX={"A_SETTING": "OVERRIDDEN"}):
+            assert loader_settings.A_SETTING == "OVERRIDDEN"
+
+    def test_mapping_shared_by_keys(self, settings):
+        settings.TEST_PREFIX = {"A_SETTING": "NEW_VALUE"}
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT", "ANOTHER_SETTING": "AMAZING"},
+            "TEST_PREFIX",
+            loaders=[DjangoLoader],
+        )
+
+        loader_settings._setup(loader_settings.defaults, loader_settings.prefix)
+
+        assert DjangoLoader._mappings["TEST_PREFIX"] is settings.TEST_PREFIX
+
+    def test_other_settings_ignored(self, settings, mocker):
+        settings.TEST_PREFIX = {"A_SETTING": "NEW_VALUE"}
+        loader_settings = Settings(
+            {"A_SETTING": "DEFAULT"}, "TEST_PREFIX", loaders=[DjangoLoader]
+        )
+        assert loader_settings.A_SETTING == "NEW_VALUE"
+        invalidate = mocker.spy(loader_settings, "invalidate")
+
+        settings.OTHER_PREFIX = {"A_SETTING": "OTHER"}
+
+        invalidate.assert_not_called()
+
+
+def test_bulk_ownership_one_call_per_loader(settings, monkeypatch, mocker):
+    settings.TEST_PREFIX = {"DJANGO": "django"}
+    monkeypatch.setenv("TEST_PREFIX_ENVIRON", "environ")
+    django_bulk = mocker.spy(DjangoLoader, "bulk_has_keys")
+    environ_bulk = mocker.spy(EnvironLoader, "bulk_has_keys")
+    environ_has_key = mocker.spy(EnvironLoader, "has_key")
+    loader_settings = Settings(
+        {"DJANGO": "DEFAULT", "ENVIRON": "DEFAULT", "DEFAULT": "default"},
+        "TEST_PREFIX",
+        loaders=[DjangoLoader, EnvironLoader],
+    )
+
+    assert loader_settings.DJANGO == "django"
+    assert loader_settings.ENVIRON == "environ"
+    assert loader_settings.DEFAULT == "default"
+
+    django_bulk.assert_called_once_with("TEST_PREFIX", ["DJANGO", "ENVIRON", "DEFAULT"])
+    environ_bulk.assert_called_once()
+    environ_has_key.assert_not_called()
+
+
+def test_bulk_ownership_mixed_with_per_key_loaders(monkeypatch):
+    CountingLoader.probes = []
+    monkeypatch.setattr(DictLoader, "values", {"DICT": "dict"})
+    monkeypatch.setenv("TEST_PREFIX_COUNTED", "counted")
+    loader_settings = Settings(
+        {"DICT": "DEFAULT", "COUNTED": "DEFAULT"},
+        "TEST_PREFIX",
+        loaders=[DictLoader, CountingLoader],
+    )
+
+    assert loader_settings.DICT == "dict"
+    assert loader_settings.COUNTED == "counted"
+    # CountingLoader overrides has_key, so EnvironLoader.bulk_has_keys is unused
+    assert CountingLoader.probes == ["COUNTED"]
+
+
+class WarmStartLoader(DictLoader):
+    """Dynamic loader that can be made unavailable, as early in boot."""
+
+    ready = True
+
+    def has_key(self):
+        if not self.ready:
+            raise LoaderNotReady
+        return super().has_key()
+
+    def get_value(self):
+        if not self.ready:
+            raise LoaderNotReady
+        return super().get_value()
+
+    @classmethod
+    def bulk_values(cls, prefix, keys):
+        return {key: cls.values[key] for key in keys if key in cls.values}
+
+
+class TestWarmStart:
+    @pytest.fixture
+    def warm_path(self, tmp_path, monkeypatch):
+        CountingLoader.probes = []
+        monkeypatch.setattr(WarmStartLoader, "values", {"DYNAMIC": "dynamic"})
+        monkeypatch.setattr(WarmStartLoader, "ready", True)
+        monkeypatch.setenv("TEST_PREFIX_COUNTED", "counted")
+        return str(tmp_path / "warm.json")
+
+    def make_settings(self, warm_path, **defaults):
+        return Settings(
+            {"DYNAMIC": "DEFAULT", "COUNTED": "DEFAULT", **defaults},
+            "TEST_PREFIX",
+            loaders=[WarmStartLoader, CountingLoader],
+            warm_start=warm_path,
+        )
+
+    def test_written_once_every_key_is_resolved(self, warm_path):
+        loader_settings = self.make_settings(warm_path)
+        assert loader_settings.DYNAMIC == "dynamic"
+        assert not os.path.exists(warm_path)
+
+        assert loader_settings.COUNTED == "counted"
+        with open(warm_path) as warm_file:
+            data = json.load(warm_file)
+        assert data["owners"] == {
+            "DYNAMIC": f"{__name__}.WarmStartLoader",
+            "COUNTED": f"{__name__}.CountingLoader",
+        }
+        # Only values of dynamic loaders are kept
+        assert data["values"] == {"DYNAMIC": "dynamic"}
+
+    def test_new_owners_found_despite_file(self, warm_path, monkeypatch):
+        self.make_settings(warm_path, FRESH="default").warm()
+        monkeypatch.setenv("TEST_PREFIX_FRESH", "from env")
+
+        loader_settings = self.make_settings(warm_path, FRESH="default")
+
+        assert loader_settings.FRESH == "from env"
+        loader_settings.warm()
+        with open(warm_path) as warm_file:
+            owners = json.load(warm_file)["owners"]
+        assert owners["FRESH"] == f"{__name__}.CountingLoader"
+
+    def test_unchanged_file_not_written_again(self, warm_path, mocker):
+        self.make_settings(warm_path).warm()
+        replace = mocker.spy(os, "replace")
+
+        self.make_settings(warm_path).warm()
+
+        replace.assert_not_called()
+
+    def test_last_value_served_while_not_ready(self, warm_path, monkeypatch):
+        self.make_settings(warm_path).warm()
+        monkeypatch.setattr(WarmStartLoader, "ready", False)
+
+        loader_settings = self.make_settings(warm_path)
+
+        assert loader_settings.DYNAMIC == "dynamic"
+        monkeypatch.setattr(WarmStartLoader, "ready", True)
+        WarmStartLoader.values["DYNAMIC"] = "changed"
+        assert loader_settings.DYNAMIC == "changed"
+
+    def test_default_served_while_not_ready_without_file(self, warm_path, monkeypatch):
+        monkeypatch.setattr(WarmStartLoader, "ready", False)
+        loader_settings = self.make_settings(warm_path)
+
+        assert loader_settings.DYNAMIC == "DEFAULT"
+        loader_settings.warm()
+        # Not written, the owners may be wrong
+        assert not os.path.exists(warm_path)
+
+    def test_fingerprint_mismatch_ignored(self, warm_path):
+        self.make_settings(warm_path).warm()
+        CountingLoader.probes = []
+
+        loader_settings = self.make_settings(warm_path, NEW="new")
+
+        assert loader_settings.COUNTED == "counted"
+        assert CountingLoader.probes == ["COUNTED"]
+
+    def test_secret_values_not_written(self, warm_path, monkeypatch):
+        WarmStartLoader.values["DYNAMIC"] = "%%fish%%"
+        self.make_settings(warm_path).warm()
+
+        with open(warm_path) as warm_file:
+            assert json.load(warm_file)["values"] == {}
+
+    def test_unreadable_file_ignored(self, warm_path):
+        with open(warm_path, "w") as warm_file:
+            warm_file.write("{not json")
+
+        assert self.make_settings(warm_path).COUNTED == "counted"
+
+
+class TestDerived:
+    @pytest.fixture
+    def loader_settings(self, settings, monkeypatch):
+        settings.TEST_PREFIX = {"PATTERN": "^fish"}
+        monkeypatch.setattr(DictLoader, "values", {"HOSTS": "a,b"})
+        return Settings(
+            {"PATTERN": "DEFAULT", "HOSTS": "DEFAULT", "OTHER": "other"},
+            "TEST_PREFIX",
+            loaders=[DictLoader, DjangoLoader],
+        )
+
+    def test_memoized_until_a_read_setting_changes(self, loader_settings, settings):
+        calls = []
+
+        @loader_settings.derived
+        def PATTERN_RE(config):
+            calls.append(config.PATTERN)
+            return re.compile(config.PATTERN)
+
+        assert loader_settings.PATTERN_RE.pattern == "^fish"
+        assert loader_settings.PATTERN_RE is loader_settings.PATTERN_RE
+        loader_settings.invalidate("OTHER")
+        assert loader_settings.PATTERN_RE.pattern == "^fish"
+        assert calls == ["^fish"]
+
+        settings.TEST_PREFIX = {"PATTERN": "^chips"}
+        assert loader_settings.PATTERN_RE.pattern == "^chips"
+        assert calls == ["^fish", "^chips"]
+
+    def test_dynamic_values_compared(self, loader_settings):
+        @loader_settings.derived
+        def HOST_LIST(config):
+            return config.HOSTS.split(",")
+
+        assert loader_settings.HOST_LIST == ["a", "b"]
+        DictLoader.values["HOSTS"] = "c"
+        assert loader_settings.HOST_LIST == ["c"]
+
+    def test_depends_on_other_derived_values(self, loader_settings, settings):
+        @loader_settings.derived
+        def PATTERN_RE(config):
+            return re.compile(config.PATTERN)
+
+        @loader_settings.derived
+        def MATCHES(config):
+            return bool(config.PATTERN_RE.match("fish"))
+
+        assert loader_settings.MATCHES
+        settings.TEST_PREFIX = {"PATTERN": "^chips"}
+        assert not loader_settings.MATCHES
+
+    def test_recomputed_after_reconfigure(self, loader_settings):
+        calls = []
+
+        @loader_settings.derived
+        def OTHER_UPPER(config):
+            calls.append(config.OTHER)
+            return config.OTHER.upper()
+
+        assert loader_settings.OTHER_UPPER == "OTHER"
+        loader_settings.reconfigure()
+        assert loader_settings.OTHER_UPPER == "OTHER"
+        assert len(calls) == 2
+
+    def test_name_clash(self, loader_settings):
+        with pytest.raises(ImproperlyConfigured):
+
+            @loader_settings.derived
+            def OTHER(config):
+                return None
+
+    def test_async(self, loader_settings):
+        @loader_settings.derived
+        def OTHER_UPPER(config):
+            return config.OTHER.upper()
+
+        assert asyncio.run(loader_settings.aget("OTHER_UPPER")) == "OTHER"
+        values = asyncio.run(loader_settings.aload_all())
+        assert values["OTHER_UPPER"] == "OTHER"
+        assert values["OTHER"] == "other"
+
+    def test_version(self, loader_settings):
+        version = loader_settings.version
+
+        loader_settings.invalidate("OTHER")
+        assert loader_settings.version == version + 1
+        loader_settings.invalidate()
+        assert loader_settings.version == version + 2